@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Benchmarks configuration.
+
+The database is taken from ``SQLALCHEMY_DATABASE_URI`` (SQLite by default)
+and indexing goes to an in-memory stub, so that only this module's code
+and the database are measured.
+"""
+
+import os
+import tracemalloc
+
+import pytest
+from flask_principal import Identity
+from invenio_access import any_user
+from invenio_app.factory import create_api
+from invenio_db import db
+from invenio_records.api import Record
+from invenio_records.models import RecordMetadataBase
+from invenio_records_permissions.generators import AnyUser
+from invenio_records_permissions.policies.records import RecordPermissionPolicy
+from invenio_records_resources.services import RecordService, \
+    RecordServiceConfig
+
+from invenio_drafts_resources.drafts import DraftBase, DraftMetadataBase
+from invenio_drafts_resources.resources import DraftResource
+from invenio_drafts_resources.services import RecordDraftService, \
+    RecordDraftServiceConfig
+
+
+class InMemoryIndexer(object):
+    """Indexer stub keeping the documents in memory."""
+
+    documents = {}
+
+    def index(self, record):
+        """Index a record."""
+        self.documents[str(record.id)] = record.dumps()
+
+    def delete(self, record):
+        """Delete a record."""
+        self.documents.pop(str(record.id), None)
+
+
+class BenchPermissionPolicy(RecordPermissionPolicy):
+    """Allow everything."""
+
+    can_create = [AnyUser()]
+    can_read = [AnyUser()]
+    can_update = [AnyUser()]
+
+
+class BenchDraftMetadata(db.Model, DraftMetadataBase):
+    """Draft model."""
+
+    __tablename__ = "bench_drafts_metadata"
+
+
+class BenchDraft(DraftBase):
+    """Draft API."""
+
+    model_cls = BenchDraftMetadata
+
+
+class BenchRecordMetadata(db.Model, RecordMetadataBase):
+    """Record model."""
+
+    __tablename__ = "bench_records_metadata"
+
+
+class BenchRecord(Record):
+    """Record API."""
+
+    model_cls = BenchRecordMetadata
+
+
+class BenchRecordServiceConfig(RecordServiceConfig):
+    """Record service config."""
+
+    record_cls = BenchRecord
+    permission_policy_cls = BenchPermissionPolicy
+    indexer_cls = InMemoryIndexer
+
+
+class BenchDraftServiceConfig(RecordDraftServiceConfig):
+    """Draft service config."""
+
+    draft_cls = BenchDraft
+    record_cls = BenchRecord
+    permission_policy_cls = BenchPermissionPolicy
+    indexer_cls = InMemoryIndexer
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Application with the draft resource and a fresh database."""
+    app = create_api(
+        SQLALCHEMY_DATABASE_URI=os.environ.get(
+            "SQLALCHEMY_DATABASE_URI", "sqlite:///drafts-benchmarks.db"
+        ),
+        RECORDS_REST_ENDPOINTS={},
+        SECRET_KEY="benchmarks",
+        DRAFTS_RESOURCES_RATELIMIT_ENABLED=False,
+    )
+    app.register_blueprint(
+        DraftResource(service=RecordDraftService(
+            config=BenchDraftServiceConfig
+        )).as_blueprint("bench_draft_resource")
+    )
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture(scope="session")
+def draft_cls():
+    """Draft API class."""
+    return BenchDraft
+
+
+@pytest.fixture(scope="session")
+def draft_service():
+    """Draft service."""
+    return RecordDraftService(config=BenchDraftServiceConfig)
+
+
+@pytest.fixture(scope="session")
+def record_service():
+    """Record service."""
+    return RecordService(config=BenchRecordServiceConfig)
+
+
+@pytest.fixture()
+def identity():
+    """Identity providing the ``any_user`` need."""
+    identity = Identity(1)
+    identity.provides.add(any_user)
+    return identity
+
+
+@pytest.fixture(params=[1, 100], ids=["1KB", "100KB"])
+def document(request):
+    """Draft document of a given size."""
+    return {
+        "_created_by": 1,
+        "title": "A benchmark",
+        "description": "x" * (request.param * 1024),
+    }
+
+
+@pytest.fixture()
+def bench(benchmark):
+    """Benchmark fixture also reporting percentiles and allocations.
+
+    The timings are taken without tracing the allocations, which are
+    measured on one extra call. The extra numbers end up in ``extra_info``
+    and thus in the saved runs.
+    """
+    def run(func, *args, **kwargs):
+        InMemoryIndexer.documents.clear()
+        result = benchmark(func, *args, **kwargs)
+
+        InMemoryIndexer.documents.clear()
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            InMemoryIndexer.documents.clear()
+        benchmark.extra_info["peak_alloc_kb"] = round(peak / 1024, 1)
+
+        data = sorted(benchmark.stats.stats.data)
+        for percentile in (50, 95, 99):
+            index = min(len(data) - 1, int(len(data) * percentile / 100))
+            benchmark.extra_info["p{}_ms".format(percentile)] = round(
+                data[index] * 1000, 3
+            )
+        return result
+
+    return run
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+r"""Benchmark the compressed storage of draft documents.
+
+Usage:
+
+.. code-block:: console
+
+    $ python benchmarks/draft_json_compression.py
+    $ SQLALCHEMY_DATABASE_URI=postgresql+psycopg2://user:pw@localhost/bench \
+        python benchmarks/draft_json_compression.py
+
+It prints, for the plain JSON column and each compression variant, the
+stored size of the drafts and the time it takes to write and read them.
+"""
+
+import os
+import random
+import time
+
+import sqlalchemy as sa
+from sqlalchemy_utils.types import JSONType
+
+from invenio_drafts_resources.drafts.types import CompressedJSONType, \
+    train_dictionary, zstandard
+
+N_DRAFTS = int(os.environ.get("BENCH_N_DRAFTS", 1000))
+N_CREATORS = int(os.environ.get("BENCH_N_CREATORS", 200))
+
+WORDS = (
+    "data analysis detector collision energy measurement particle physics "
+    "open access software dataset calibration simulation experiment"
+).split()
+
+
+def make_draft(i):
+    """Create a draft resembling a real one."""
+    rand = random.Random(i)
+    return {
+        "_access": {"metadata_restricted": False, "files_restricted": False},
+        "_owners": [rand.randint(1, 1000)],
+        "_created_by": rand.randint(1, 1000),
+        "title": " ".join(rand.choice(WORDS) for _ in range(8)),
+        "description": " ".join(rand.choice(WORDS) for _ in range(300)),
+        "creators": [
+            {
+                "name": "Creator {}".format(rand.randint(1, 10000)),
+                "type": "Personal",
+                "affiliations": [{"name": "CERN", "identifier": "01ggx4157"}],
+                "identifiers": {"orcid": "0000-0002-1825-{:04d}".format(n)},
+            }
+            for n in range(N_CREATORS)
+        ],
+        "keywords": [rand.choice(WORDS) for _ in range(10)],
+    }
+
+
+def variants(dictionary):
+    """Column types to compare."""
+    yield "json (text)", JSONType()
+    yield "zlib", CompressedJSONType()
+    yield "zlib + dictionary", CompressedJSONType(dictionary=dictionary)
+    if zstandard is not None:
+        yield "zstd", CompressedJSONType(codec="zstd")
+        yield "zstd + dictionary", CompressedJSONType(
+            codec="zstd", dictionary=dictionary
+        )
+
+
+def run(engine, name, column_type, drafts):
+    """Write and read the drafts with a column type."""
+    metadata = sa.MetaData()
+    table = sa.Table(
+        "bench_drafts_compression", metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("json", column_type),
+    )
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    try:
+        rows = [{"id": i, "json": d} for i, d in enumerate(drafts)]
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            conn.execute(table.insert(), rows)
+        write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with engine.connect() as conn:
+            loaded = [
+                row[0] for row in conn.execute(sa.select([table.c.json]))
+            ]
+        read = time.perf_counter() - start
+        assert loaded == drafts
+
+        with engine.connect() as conn:
+            size = conn.execute(
+                sa.select([sa.func.sum(sa.func.length(table.c.json))])
+            ).scalar()
+        return size, write, read
+    finally:
+        metadata.drop_all(engine)
+
+
+def main():
+    """Run the benchmark."""
+    engine = sa.create_engine(
+        os.environ.get("SQLALCHEMY_DATABASE_URI", "sqlite://")
+    )
+    drafts = [make_draft(i) for i in range(N_DRAFTS)]
+    # Train on other drafts than the measured ones.
+    dictionary = train_dictionary(
+        [make_draft(-i) for i in range(1, 201)], size=32768
+    )
+
+    print("# {} drafts, {}".format(N_DRAFTS, engine.dialect.name))
+    print("{:<20} {:>12} {:>8} {:>12} {:>12}".format(
+        "column", "size (KB)", "ratio", "write (ms)", "read (ms)"))
+    baseline = None
+    for name, column_type in variants(dictionary):
+        size, write, read = run(engine, name, column_type, drafts)
+        baseline = baseline or size
+        print("{:<20} {:>12.0f} {:>7.1f}x {:>12.1f} {:>12.1f}".format(
+            name, size / 1024, baseline / size, write * 1000, read * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+r"""Benchmark metadata-only draft loading with and without the JSON column.
+
+Usage:
+
+.. code-block:: console
+
+    $ python benchmarks/draft_json_loading.py
+    $ SQLALCHEMY_DATABASE_URI=postgresql+psycopg2://user:pw@localhost/bench \
+        python benchmarks/draft_json_loading.py
+
+It prints the SQL/query plan of both loading strategies and the time it
+takes to read the status of every draft.
+"""
+
+import os
+import time
+
+from flask import Flask
+from invenio_db import InvenioDB, db
+
+from invenio_drafts_resources.drafts import DraftBase, DraftMetadataBase
+
+N_DRAFTS = int(os.environ.get("BENCH_N_DRAFTS", 2000))
+DOC_SIZE_KB = int(os.environ.get("BENCH_DOC_SIZE_KB", 100))
+
+
+class BenchDraftMetadata(db.Model, DraftMetadataBase):
+    """Draft model for the benchmark."""
+
+    __tablename__ = "bench_drafts_metadata"
+
+
+class BenchDraft(DraftBase):
+    """Draft API for the benchmark."""
+
+    model_cls = BenchDraftMetadata
+
+
+def create_app():
+    """Create a minimal application."""
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=os.environ.get(
+            "SQLALCHEMY_DATABASE_URI", "sqlite://"
+        ),
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+    )
+    InvenioDB(app)
+    return app
+
+
+def explain(query):
+    """Return the query plan (or the SQL statement if not supported)."""
+    statement = query.statement.compile(
+        dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}
+    )
+    if db.engine.dialect.name == "postgresql":
+        rows = db.session.execute("EXPLAIN ANALYZE {}".format(statement))
+        return "\n".join(row[0] for row in rows)
+    return str(statement)
+
+
+def timed(label, func, repeat=5):
+    """Run a function several times and print the best timing."""
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    print("{:<30} {:>10.2f} ms".format(label, min(timings) * 1000))
+
+
+def main():
+    """Run the benchmark."""
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        try:
+            payload = {"description": "x" * (DOC_SIZE_KB * 1024)}
+            for _ in range(N_DRAFTS):
+                BenchDraft.create(dict(payload, _created_by=1))
+            db.session.commit()
+
+            full_query = BenchDraftMetadata.query
+            lazy_query = BenchDraft.metadata_query()
+
+            print("# Full load plan\n{}\n".format(explain(full_query)))
+            print("# Deferred JSON plan\n{}\n".format(explain(lazy_query)))
+
+            print("# {} drafts of ~{} KB".format(N_DRAFTS, DOC_SIZE_KB))
+            timed(
+                "status (full load)",
+                lambda: [m.status for m in full_query.all()],
+            )
+            timed(
+                "status (deferred JSON)",
+                lambda: [m.status for m in lazy_query.all()],
+            )
+        finally:
+            db.session.remove()
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+r"""Benchmark the memory of the draft and generic record resource units.
+
+Usage:
+
+.. code-block:: console
+
+    $ python benchmarks/resource_unit_memory.py
+    $ BENCH_N_UNITS=1000000 python benchmarks/resource_unit_memory.py
+
+It prints the memory allocated to create many units of each class.
+"""
+
+import os
+import tracemalloc
+from collections import namedtuple
+
+from invenio_records_resources.resource_units import IdentifiedRecord
+
+from invenio_drafts_resources.resource_units import IdentifiedRecordDraft
+
+N_UNITS = int(os.environ.get("BENCH_N_UNITS", 100000))
+
+PID = namedtuple("PID", ["pid_value"])
+
+
+def traced_size(factory):
+    """Memory allocated by creating N_UNITS units."""
+    tracemalloc.start()
+    try:
+        units = [factory() for _ in range(N_UNITS)]
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(units) == N_UNITS
+    return size
+
+
+def main():
+    """Run the benchmark."""
+    pid = PID("12345")
+    record = {}
+
+    print("# {} units".format(N_UNITS))
+    for name, cls in (("IdentifiedRecord", IdentifiedRecord),
+                      ("IdentifiedRecordDraft", IdentifiedRecordDraft)):
+        size = traced_size(lambda: cls(pid=pid, record=record))
+        print("{:<24} {:>10.1f} KB".format(name, size / 1024))
+
+
+if __name__ == "__main__":
+    main()
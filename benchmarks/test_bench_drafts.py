@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Drafts API, service, serializer and resource benchmarks."""
+
+import json
+
+from invenio_db import db
+
+from invenio_drafts_resources.resource_units import IdentifiedRecordDraft
+from invenio_drafts_resources.serializers import DraftJSONSerializer
+
+BULK_SIZE = 100
+HEADERS = {"content-type": "application/json", "accept": "application/json"}
+
+
+def test_api_create(app, bench, draft_cls, document):
+    """DraftBase.create and commit."""
+    def create():
+        draft_cls.create(document)
+        db.session.commit()
+
+    bench(create)
+
+
+def test_api_get_drafts_bulk(app, bench, draft_cls, document):
+    """DraftBase.get_drafts over a bulk of drafts."""
+    ids = [draft_cls.create(document).id for _ in range(BULK_SIZE)]
+    db.session.commit()
+
+    def get_drafts():
+        db.session.expunge_all()
+        draft_cls.get_drafts(ids)
+
+    bench(get_drafts)
+
+
+def test_service_create(app, bench, draft_service, identity, document):
+    """RecordDraftService.create of a single draft."""
+    bench(draft_service.create, document, identity)
+
+
+def test_service_create_bulk(app, bench, draft_service, identity,
+                             document):
+    """RecordDraftService.create of a bulk of drafts."""
+    def create_bulk():
+        for _ in range(BULK_SIZE):
+            draft_service.create(document, identity)
+
+    bench(create_bulk)
+
+
+def test_service_edit(app, bench, draft_service, record_service, identity,
+                      document):
+    """RecordDraftService.edit of an existing record."""
+    recid = record_service.create(document, identity).id
+    bench(draft_service.edit, recid, document, identity)
+
+
+def test_serializer(app, bench, draft_service, identity, document):
+    """DraftJSONSerializer.serialize_object."""
+    unit = draft_service.create(document, identity)
+    serializer = DraftJSONSerializer()
+    with app.test_request_context():
+        bench(serializer.serialize_object, unit)
+
+
+def test_resource_edit(app, bench, record_service, identity, document):
+    """POST /records/<pid_value>/draft."""
+    recid = record_service.create(document, identity).id
+    data = json.dumps(document)
+    client = app.test_client()
+
+    def post():
+        response = client.post(
+            "/records/{}/draft".format(recid), data=data, headers=HEADERS
+        )
+        assert response.status_code == 201
+
+    bench(post)
+
+
+def test_resource_units_bulk(bench):
+    """Creation of a bulk of draft resource units."""
+    def create_units():
+        return [IdentifiedRecordDraft() for _ in range(BULK_SIZE * 100)]
+
+    bench(create_units)
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Drafts management commands."""
+
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from invenio_base.utils import obj_or_import_string
+from invenio_indexer.api import RecordIndexer
+from invenio_search.utils import build_alias_name
+
+from .drafts.counters import reconcile_counters
+from .drafts.ndjson import export_drafts, import_drafts
+from .proxies import current_drafts_resources
+from .reindex import ReindexState, catch_up, create_index, new_index_name, \
+    reindex, swap_alias
+
+
+def _draft_cls(value):
+    """Get the draft API class from the option or the configuration."""
+    draft_cls = obj_or_import_string(
+        value or current_app.config.get("DRAFTS_RESOURCES_DRAFT_CLS")
+    )
+    if draft_cls is None:
+        raise click.UsageError(
+            "Missing draft class, use --draft-cls or set "
+            "DRAFTS_RESOURCES_DRAFT_CLS."
+        )
+    return draft_cls
+
+
+draft_cls_option = click.option(
+    "--draft-cls", default=None,
+    help="Import path of the draft API class "
+         "(default: DRAFTS_RESOURCES_DRAFT_CLS).",
+)
+
+
+@click.group()
+def drafts():
+    """Drafts management commands."""
+
+
+@drafts.command("export")
+@draft_cls_option
+@click.option("--output", "-o", type=click.File("w"), default="-",
+              help="Output NDJSON file (default: stdout).")
+@click.option("--chunk-size", default=1000, show_default=True)
+@with_appcontext
+def export(draft_cls, output, chunk_size):
+    """Export all the drafts as NDJSON."""
+    model_cls = _draft_cls(draft_cls).model_cls
+    for line in export_drafts(model_cls, chunk_size=chunk_size):
+        output.write(line)
+
+
+@drafts.command("import")
+@draft_cls_option
+@click.option("--input", "-i", "input_", type=click.File("r"), default="-",
+              help="Input NDJSON file (default: stdin).")
+@click.option("--batch-size", default=1000, show_default=True)
+@click.option("--record-cls", default=None,
+              help="Import path of the record API class, to also count the "
+                   "stale drafts.")
+@with_appcontext
+def import_(draft_cls, input_, batch_size, record_cls):
+    """Import drafts from NDJSON, keeping their ids."""
+    draft_cls = _draft_cls(draft_cls)
+    count = import_drafts(draft_cls.model_cls, input_, batch_size=batch_size)
+    click.secho("Imported {} drafts.".format(count), fg="green", err=True)
+    if draft_cls.counters_model_cls is not None:
+        record_model_cls = None
+        if record_cls:
+            record_model_cls = obj_or_import_string(record_cls).model_cls
+        reconcile_counters(draft_cls, record_model_cls=record_model_cls)
+
+
+@drafts.command("archive")
+@draft_cls_option
+@click.option("--expired-days", type=int, default=None,
+              help="Also archive the drafts expired since this many days.")
+@click.option("--batch-size", default=1000, show_default=True)
+@with_appcontext
+def archive(draft_cls, expired_days, batch_size):
+    """Move the drafts in a terminal state to the archive table."""
+    draft_cls = _draft_cls(draft_cls)
+    if draft_cls.archive_model_cls is None:
+        raise click.UsageError(
+            "{} has no archive model.".format(draft_cls.__name__)
+        )
+    expired_before = None
+    if expired_days is not None:
+        expired_before = datetime.utcnow() - timedelta(days=expired_days)
+    count = draft_cls.archive(
+        expired_before=expired_before, batch_size=batch_size,
+        indexer=RecordIndexer(),
+    )
+    click.secho("Archived {} drafts.".format(count), fg="green", err=True)
+
+
+@drafts.command("reconcile-counters")
+@draft_cls_option
+@click.option("--record-cls", default=None,
+              help="Import path of the record API class, to also count the "
+                   "stale drafts.")
+@click.option("--chunk-size", default=1000, show_default=True)
+@with_appcontext
+def reconcile(draft_cls, record_cls, chunk_size):
+    """Recompute the per-owner counters of the drafts."""
+    draft_cls = _draft_cls(draft_cls)
+    if draft_cls.counters_model_cls is None:
+        raise click.UsageError(
+            "{} has no counters model.".format(draft_cls.__name__)
+        )
+    record_model_cls = None
+    if record_cls:
+        record_model_cls = obj_or_import_string(record_cls).model_cls
+    count = reconcile_counters(
+        draft_cls, record_model_cls=record_model_cls, chunk_size=chunk_size
+    )
+    click.secho("Reconciled {} counters.".format(count), fg="green",
+                err=True)
+
+
+@drafts.command("reindex")
+@draft_cls_option
+@click.option("--alias", required=True,
+              help="Alias of the drafts index, without prefix.")
+@click.option("--mapping", type=click.File("r"), default=None,
+              help="JSON file with the new index mappings and settings "
+                   "(default: the ones of the current index).")
+@click.option("--partitions", default=64, show_default=True,
+              help="Number of id ranges the drafts are split in.")
+@click.option("--processes", type=int, default=None,
+              help="Number of worker processes (default: CPU count).")
+@click.option("--chunk-size", default=500, show_default=True)
+@click.option("--state-file", default="drafts-reindex.json",
+              show_default=True,
+              help="File to track progress and resume from.")
+@click.option("--service", default="draft", show_default=True,
+              help="Name of the drafts service, whose indexer is used.")
+@with_appcontext
+def reindex_drafts(draft_cls, alias, mapping, partitions, processes,
+                   chunk_size, state_file, service):
+    """Reindex all the drafts into a new index and swap the alias.
+
+    If the state file exists, the interrupted reindex is resumed.
+    """
+    draft_cls = _draft_cls(draft_cls)
+    indexer_cls = current_drafts_resources.service(service).config. \
+        indexer_cls
+    alias = build_alias_name(alias)
+
+    if os.path.exists(state_file):
+        state = ReindexState.load(state_file)
+        if state.alias != alias:
+            raise click.UsageError(
+                "State file {} belongs to alias {}.".format(
+                    state_file, state.alias)
+            )
+        click.secho("Resuming reindex into {} ({}/{} partitions done)."
+                    .format(state.index, len(state.done), state.partitions),
+                    fg="yellow", err=True)
+    else:
+        state = ReindexState(
+            state_file, alias=alias, index=new_index_name(alias),
+            partitions=partitions,
+        )
+        create_index(alias, state.index,
+                     mapping=json.load(mapping) if mapping else None)
+        state.save()
+        click.secho("Reindexing into {}.".format(state.index), err=True)
+
+    total = 0
+    start = time.time()
+    pending = state.partitions - len(state.done)
+    with click.progressbar(reindex(draft_cls, indexer_cls, state,
+                                   processes=processes,
+                                   chunk_size=chunk_size),
+                           length=pending, label="Partitions",
+                           file=click.get_text_stream("stderr")) as bar:
+        for number, count in bar:
+            total += count
+            elapsed = time.time() - start
+            bar.label = "Partitions ({} drafts, {:.0f} drafts/s)".format(
+                total, total / elapsed if elapsed else 0)
+
+    # Drafts written during the reindex, then before the swap.
+    total += catch_up(draft_cls, indexer_cls, state, chunk_size=chunk_size)
+    swap_alias(alias, state.index)
+    total += catch_up(draft_cls, indexer_cls, state, chunk_size=chunk_size)
+    state.remove()
+    click.secho("Indexed {} drafts, alias {} now points to {}.".format(
+        total, alias, state.index), fg="green", err=True)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Negotiated compression of the draft responses.
+
+The encoding is picked among ``DRAFTS_RESOURCES_COMPRESSION_ENCODINGS``
+according to the ``Accept-Encoding`` request header. The body is compressed
+chunk by chunk while it is sent, so that a compressed copy of a large draft
+is never held in memory next to the serialized one. Brotli (``br``) and
+Zstandard (``zstd``) are only offered when ``brotli`` and ``zstandard`` are
+installed.
+"""
+
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class _BrotliCompressor(object):
+    """Brotli compressor with the interface of the zlib ones."""
+
+    def __init__(self, level=4):
+        """Constructor."""
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        """Compress a chunk."""
+        return self._compressor.process(bytes(data))
+
+    def flush(self):
+        """Finish the stream."""
+        return self._compressor.finish()
+
+
+def _gzip(level=6):
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+def _zstd(level=3):
+    return zstandard.ZstdCompressor(level=level).compressobj()
+
+
+compressors = {"gzip": _gzip}
+"""Compressor factories (taking the compression level) by encoding."""
+
+if brotli is not None:
+    compressors["br"] = _BrotliCompressor
+if zstandard is not None:
+    compressors["zstd"] = _zstd
+
+
+def negotiate_encoding(accept_encodings, offered):
+    """Pick the encoding preferred by the client among the offered ones.
+
+    On equal preference, the first offered encoding wins.
+    """
+    offered = [e for e in offered if e in compressors]
+    return accept_encodings.best_match(offered) if offered else None
+
+
+def compress_stream(compressor, chunks, chunk_size):
+    """Compress the chunks of a body, at most ``chunk_size`` at a time."""
+    for chunk in chunks:
+        view = memoryview(chunk)
+        for start in range(0, len(view), chunk_size):
+            data = compressor.compress(view[start:start + chunk_size])
+            if data:
+                yield data
+    yield compressor.flush()
+
+
+def compress_response(response):
+    """Compress the body of a response, if accepted and large enough."""
+    config = current_app.config
+    if not config["DRAFTS_RESOURCES_COMPRESSION_ENABLED"] or \
+            response.direct_passthrough or response.is_streamed or \
+            "Content-Encoding" in response.headers:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    # Summed over the body chunks, without joining them.
+    length = response.calculate_content_length()
+    if length is None or \
+            length < config["DRAFTS_RESOURCES_COMPRESSION_MIN_SIZE"]:
+        return response
+
+    encoding = negotiate_encoding(
+        request.accept_encodings,
+        config["DRAFTS_RESOURCES_COMPRESSION_ENCODINGS"],
+    )
+    if encoding is None:
+        return response
+
+    factory = compressors[encoding]
+    level = config["DRAFTS_RESOURCES_COMPRESSION_LEVELS"].get(encoding)
+    compressor = factory() if level is None else factory(level)
+    response.response = compress_stream(
+        compressor, response.iter_encoded(),
+        config["DRAFTS_RESOURCES_COMPRESSION_CHUNK_SIZE"],
+    )
+    response.headers["Content-Encoding"] = encoding
+    response.headers.pop("Content-Length", None)
+    return response
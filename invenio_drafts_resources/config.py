@@ -13,4 +13,124 @@ DRAFTS_RESOURCES_LINK_URLS = {
     'record': '{base}/records/{pid}',
     'records': '{base}/records/',
     'draft': '{base}/records/{pid}/draft/',
+    'publish_job': '{base}/drafts/publish-jobs/{job_id}',
 }
+
+DRAFTS_RESOURCES_DRAFT_CLS = None
+"""Draft API class (or import path) used by the ``drafts`` CLI commands."""
+
+DRAFTS_RESOURCES_PROFILING_ENABLED = False
+"""Record per-phase timings and query counts of the draft requests.
+
+They are sent in the ``Server-Timing`` response header and exposed as
+Prometheus metrics on ``/drafts/metrics``.
+"""
+
+DRAFTS_RESOURCES_PROFILING_SAMPLE_RATE = 0.0
+"""Fraction of the profiled requests to run under cProfile."""
+
+DRAFTS_RESOURCES_PROFILING_DIR = None
+"""Directory of the cProfile stats (default: ``<instance>/profiles``)."""
+
+DRAFTS_RESOURCES_SERVICES = {
+    "draft": "invenio_drafts_resources.services:RecordDraftService",
+    "draft_version": "invenio_drafts_resources.services:DraftVersionService",
+    "draft_file": "invenio_drafts_resources.services:DraftFileService",
+    "draft_file_metadata":
+        "invenio_drafts_resources.services:DraftFileMetadataService",
+}
+"""Services (classes or import paths), built on first use."""
+
+DRAFTS_RESOURCES_RESOURCES = {
+    "draft_publish_job":
+        "invenio_drafts_resources.resources:DraftPublishJobResource",
+    "deposit_counters":
+        "invenio_drafts_resources.resources:DepositCountersResource",
+    "draft": "invenio_drafts_resources.resources:DraftResource",
+    "draft_action": "invenio_drafts_resources.resources:DraftActionResource",
+    "draft_autosave":
+        "invenio_drafts_resources.resources:DraftAutosaveResource",
+    "draft_diff": "invenio_drafts_resources.resources:DraftDiffResource",
+    "draft_version":
+        "invenio_drafts_resources.resources:DraftVersionResource",
+    "draft_file": "invenio_drafts_resources.resources:DraftFileResource",
+    "draft_file_action":
+        "invenio_drafts_resources.resources:DraftFileActionResource",
+}
+"""Resources (classes or import paths), built on first use."""
+
+DRAFTS_RESOURCES_READ_REPLICA_URI = None
+"""Database URI of a read replica to read the drafts from."""
+
+DRAFTS_RESOURCES_READ_REPLICA_PIN_SECONDS = 10
+"""How long a user reads the drafts they wrote from the primary database.
+
+It should be larger than the replication lag.
+"""
+
+DRAFTS_RESOURCES_READ_REPLICA_PINS = \
+    "invenio_drafts_resources.routing:RedisPins"
+"""Storage of the pinned writes (class or import path, built with the app).
+
+It must be shared by all the processes serving the users. Use
+``invenio_drafts_resources.routing:PrimaryPins`` for a single process.
+"""
+
+DRAFTS_RESOURCES_READ_REPLICA_PINS_URL = None
+"""Redis URL of the pinned writes (default: ``CACHE_REDIS_URL``)."""
+
+DRAFTS_RESOURCES_RATELIMIT_ENABLED = False
+"""Rate limit the draft writes."""
+
+DRAFTS_RESOURCES_RATELIMIT_USER = (5, 30)
+"""Draft writes per second and burst allowed per user (positive numbers)."""
+
+DRAFTS_RESOURCES_RATELIMIT_DRAFT = (2, 10)
+"""Writes per second and burst allowed per draft (positive numbers)."""
+
+DRAFTS_RESOURCES_RATELIMIT_BACKEND = \
+    "invenio_drafts_resources.ratelimit:MemoryBackend"
+"""Storage of the rate limits (class or import path, built with the app).
+
+Use ``invenio_drafts_resources.ratelimit:RedisBackend`` to share the limits
+between processes.
+"""
+
+DRAFTS_RESOURCES_RATELIMIT_STORAGE_URL = None
+"""Redis URL of the rate limits (default: ``CACHE_REDIS_URL``)."""
+
+DRAFTS_RESOURCES_FEED_PUBSUB = "invenio_drafts_resources.feed:InProcessPubSub"
+"""Pub/sub of the draft changes feed.
+
+Class or import path, built with the application.
+"""
+
+DRAFTS_RESOURCES_FEED_KEEPALIVE = 15
+"""Seconds between keep-alives on the draft changes feed."""
+
+DRAFTS_RESOURCES_COMPRESSION_ENABLED = True
+"""Compress the draft responses when accepted by the client."""
+
+DRAFTS_RESOURCES_COMPRESSION_MIN_SIZE = 1024
+"""Min. size in bytes of the response bodies to compress."""
+
+DRAFTS_RESOURCES_COMPRESSION_ENCODINGS = ["zstd", "br", "gzip"]
+"""Offered encodings, by order of preference.
+
+``br`` and ``zstd`` require ``brotli`` and ``zstandard`` to be installed.
+"""
+
+DRAFTS_RESOURCES_COMPRESSION_LEVELS = {}
+"""Compression levels by encoding (default: gzip 6, br 4, zstd 3)."""
+
+DRAFTS_RESOURCES_COMPRESSION_CHUNK_SIZE = 65536
+"""Size in bytes of the chunks the response bodies are compressed by."""
+
+DRAFTS_RESOURCES_PUBLISH_BACKGROUND = False
+"""Publish the drafts in a background task, polled through a job resource.
+
+Clients can also ask for it per request with ``Prefer: respond-async``.
+"""
+
+DRAFTS_RESOURCES_PUBLISH_QUEUE = None
+"""Celery queue of the publish tasks (default: the default queue)."""
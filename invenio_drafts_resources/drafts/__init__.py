@@ -9,6 +9,13 @@
 """Drafts data access layer API."""
 
 from .api import DraftBase
-from .models import DraftMetadataBase
+from .models import DraftArchiveMetadataBase, DraftMetadataBase, \
+    DraftOwnerCounterBase, DraftRevisionMetadataBase
 
-__all__ = ("DraftBase", "DraftMetadataBase")
+__all__ = (
+    "DraftArchiveMetadataBase",
+    "DraftBase",
+    "DraftMetadataBase",
+    "DraftOwnerCounterBase",
+    "DraftRevisionMetadataBase",
+)
@@ -8,8 +8,17 @@
 
 """Draft API."""
 
+import uuid
+
 from invenio_db import db
 from invenio_records.api import Record
+from sqlalchemy import inspect
+from sqlalchemy.orm import defer
+from sqlalchemy.orm.util import identity_key
+
+from .archive import archive_drafts
+from .counters import counter_keys, draft_owners, update_counters
+from .history import DraftRevision, list_revisions, materialize, save_revision
 
 
 class DraftBase(Record):
@@ -19,6 +28,20 @@ class DraftBase(Record):
     # No default one is given, only the base.
     model_cls = None
     default_status = 'draft'
+    # Max. number of ids per ``IN`` clause when fetching many drafts.
+    fetch_chunk_size = 500
+    # Archive of the drafts in a terminal state (``None`` to never archive).
+    # All the queries (except ``get_archived``) target the hot drafts only.
+    archive_model_cls = None
+    archive_statuses = ("published", "expired")
+    # Delta-encoded revision history (``None`` to only rely on the versions
+    # table). Set ``__versioned__ = {"versioning": False}`` on the model to
+    # stop storing a full copy of every revision in the versions table.
+    history_model_cls = None
+    history_snapshot_interval = 20
+    # Per-owner counters, updated on create, commit and delete (``None`` to
+    # disable them).
+    counters_model_cls = None
 
     @property
     def expiry_date(self):
@@ -35,6 +58,190 @@ class DraftBase(Record):
         """Get revision identifier."""
         return self.model.fork_id if self.model else None
 
+    @property
+    def fork_version_id(self):
+        """Get the revision of the record the draft was forked from."""
+        return self.model.fork_version_id if self.model else None
+
+    def is_stale(self, record_model_cls):
+        """Check if the record moved past the revision the draft forked.
+
+        Only the record version is fetched, by primary key.
+
+        :param record_model_cls: Model class of the record.
+        """
+        if not self.fork_id:
+            return False
+        version_id = db.session.query(record_model_cls.version_id).filter(
+            record_model_cls.id == self.fork_id
+        ).scalar()
+        return (
+            version_id is not None and
+            version_id - 1 != self.fork_version_id
+        )
+
+    @classmethod
+    def stale_query(cls, record_model_cls):
+        """Query the drafts whose record moved past the forked revision.
+
+        It is a single join between the drafts and the records, selecting
+        only the columns needed to report the stale drafts. Only drafts
+        still being edited (``draft`` status) are considered.
+
+        :param record_model_cls: Model class of the records.
+        """
+        model_cls = cls.model_cls
+        return db.session.query(
+            model_cls.id,
+            model_cls.fork_id,
+            model_cls.fork_version_id,
+            (record_model_cls.version_id - 1).label("record_revision_id"),
+        ).join(
+            record_model_cls, record_model_cls.id == model_cls.fork_id
+        ).filter(
+            model_cls.json != None,  # noqa
+            model_cls.status == "draft",
+            record_model_cls.version_id - 1 != model_cls.fork_version_id,
+        )
+
+    @classmethod
+    def metadata_query(cls, with_deleted=False):
+        """Query over the draft models without loading their JSON document.
+
+        The ``json`` column is deferred, i.e. it is neither fetched nor
+        parsed unless it is accessed on a returned model. It is meant for
+        operations that only need the model columns (status, expiry date,
+        revision, timestamps), such as listings and expiry sweeps.
+        """
+        query = cls.model_cls.query.options(defer(cls.model_cls.json))
+        if not with_deleted:
+            query = query.filter(cls.model_cls.json != None)  # noqa
+        return query
+
+    @classmethod
+    def get_metadata(cls, id_, with_deleted=False):
+        """Retrieve a draft model without loading its JSON document.
+
+        :returns: A draft model instance, see :meth:`metadata_query`.
+        """
+        with db.session.no_autoflush:
+            return cls.metadata_query(with_deleted).filter_by(id=id_).one()
+
+    @classmethod
+    def get_drafts(cls, ids, with_deleted=False):
+        """Retrieve multiple drafts by id.
+
+        Drafts already loaded in the session are taken from its identity map,
+        the rest is fetched with one ``IN`` query per chunk of
+        :attr:`fetch_chunk_size` ids.
+
+        :param ids: List of draft ids.
+        :param with_deleted: If `True` then it includes deleted drafts.
+        :returns: A list of drafts in the same order as ``ids``. Ids not
+            found are skipped.
+        """
+        ids = [i if isinstance(i, uuid.UUID) else uuid.UUID(str(i))
+               for i in ids]
+        models = {}
+        missing = []
+        for id_ in ids:
+            model = db.session.identity_map.get(
+                identity_key(cls.model_cls, id_)
+            )
+            # Expired instances and models with a deferred document (see
+            # :meth:`metadata_query`) would trigger one refresh query each.
+            state = model is not None and inspect(model)
+            if state and not state.expired_attributes and \
+                    "json" not in state.unloaded:
+                models[id_] = model
+            elif id_ not in missing:
+                missing.append(id_)
+
+        size = cls.fetch_chunk_size
+        with db.session.no_autoflush:
+            for i in range(0, len(missing), size):
+                query = cls.model_cls.query.filter(
+                    cls.model_cls.id.in_(missing[i:i + size])
+                )
+                for model in query:
+                    models[model.id] = model
+
+        drafts = []
+        for id_ in ids:
+            model = models.get(id_)
+            if model is None or (model.json is None and not with_deleted):
+                continue
+            drafts.append(cls(model.json, model=model))
+        return drafts
+
+    @classmethod
+    def get_record(cls, id_, with_deleted=False, session=None):
+        """Retrieve a draft by its id.
+
+        :param session: Session to load the draft with (e.g. of a read
+            replica), instead of the default one.
+        """
+        if session is None:
+            return super(DraftBase, cls).get_record(
+                id_, with_deleted=with_deleted
+            )
+        with session.no_autoflush:
+            query = session.query(cls.model_cls).filter_by(id=id_)
+            if not with_deleted:
+                query = query.filter(cls.model_cls.json != None)  # noqa
+            obj = query.one()
+            return cls(obj.json, model=obj)
+
+    @classmethod
+    def get_by_fork(cls, fork_id, session=None):
+        """Retrieve the draft of an existing record.
+
+        :param fork_id: Id of the record the draft is a fork of.
+        :param session: Session to load the draft with (e.g. of a read
+            replica), instead of the default one.
+        :raises sqlalchemy.orm.exc.NoResultFound: If there is no draft.
+        """
+        session = session or db.session
+        with session.no_autoflush:
+            query = session.query(cls.model_cls).filter_by(
+                fork_id=fork_id
+            ).filter(
+                cls.model_cls.json != None  # noqa
+            ).order_by(cls.model_cls.created.desc())
+            obj = query.limit(1).one()
+            return cls(obj.json, model=obj)
+
+    @classmethod
+    def get_archived(cls, id_):
+        """Retrieve an archived draft (read-only).
+
+        :raises sqlalchemy.orm.exc.NoResultFound: If it is not archived.
+        """
+        model_cls = cls.archive_model_cls
+        obj = model_cls.query.filter_by(id=id_).order_by(
+            model_cls.archived.desc()
+        ).limit(1).one()
+        return cls(obj.json, model=obj)
+
+    @classmethod
+    def archive(cls, expired_before=None, batch_size=1000, indexer=None):
+        """Move the drafts in a terminal state to the archive.
+
+        Their revision history is removed.
+
+        :param expired_before: Also archive the drafts which expired before
+            this date.
+        :param indexer: Indexer to remove the archived drafts from the
+            search index with.
+        :returns: The number of archived drafts.
+        """
+        return archive_drafts(
+            cls.model_cls, cls.archive_model_cls, cls.archive_statuses,
+            expired_before=expired_before, batch_size=batch_size,
+            counters_model_cls=cls.counters_model_cls,
+            history_model_cls=cls.history_model_cls, indexer=indexer,
+        )
+
     @classmethod
     def create(cls, data, record=None, **kwargs):
         """Create a new draft instance and store it in the database."""
@@ -53,4 +260,111 @@ class DraftBase(Record):
 
             db.session.add(draft.model)
 
+        draft._save_revision(None)
+        draft._update_counters(set())
         return draft
+
+    def commit(self, **kwargs):
+        """Store changes of the draft in the database."""
+        previous = None
+        if self.history_model_cls is not None and self.model is not None:
+            # Rebuilt from the history, since nested values of the loaded
+            # document might have been modified in place.
+            try:
+                previous = materialize(
+                    self.history_model_cls, self.id, self.revision_id
+                )
+            except IndexError:
+                # History enabled after the draft creation, start with a
+                # snapshot.
+                pass
+        counted = self._stored_counter_keys()
+        super(DraftBase, self).commit(**kwargs)
+        self._save_revision(previous)
+        self._update_counters(counted)
+        return self
+
+    def delete(self, force=False):
+        """Delete the draft."""
+        counted = self._stored_counter_keys()
+        super(DraftBase, self).delete(force=force)
+        self._update_counters(counted, deleted=True)
+        return self
+
+    def _stored_counter_keys(self):
+        """Get the counter keys of the draft as last stored."""
+        if self.counters_model_cls is None or self.model is None:
+            return set()
+        names = ("json", "status", "expiry_date")
+        attrs = inspect(self.model).attrs
+        histories = [attrs[name].history for name in names]
+        if any(h.added and not h.deleted for h in histories):
+            # Changed before the previous value was loaded.
+            model_cls = self.model_cls
+            with db.session.no_autoflush:
+                values = db.session.query(
+                    *(getattr(model_cls, name) for name in names)
+                ).filter(model_cls.id == self.id).one()
+        else:
+            values = [
+                h.deleted[0] if h.deleted else getattr(self.model, name)
+                for name, h in zip(names, histories)
+            ]
+        document, status, expiry_date = values
+        return counter_keys(draft_owners(document), status, expiry_date)
+
+    def _update_counters(self, counted, deleted=False):
+        """Update the counters from the previously counted keys."""
+        if self.counters_model_cls is None:
+            return
+        current = set()
+        if not deleted:
+            current = counter_keys(
+                draft_owners(self), self.model.status, self.model.expiry_date
+            )
+        with db.session.begin_nested():
+            update_counters(self.counters_model_cls, counted, current)
+
+    def _save_revision(self, previous):
+        """Store the current revision in the history, if enabled."""
+        if self.history_model_cls is None:
+            return
+        with db.session.begin_nested():
+            save_revision(
+                self.history_model_cls, self.id, self.revision_id, self,
+                previous=previous,
+                snapshot_interval=self.history_snapshot_interval,
+            )
+
+    def get_revision(self, revision_id):
+        """Get the document of a revision of the draft.
+
+        :raises IndexError: If the revision does not exist.
+        """
+        if self.history_model_cls is None:
+            return dict(self.revisions[revision_id])
+        return materialize(self.history_model_cls, self.id, revision_id)
+
+    def list_revisions(self, page=1, size=10):
+        """List the revisions of the draft history, latest first.
+
+        Without a history model, the revisions of the page are taken from
+        the versions table.
+
+        :returns: A tuple with the total number of revisions and the
+            revisions of the page, materialized on access.
+        """
+        if self.history_model_cls is not None:
+            return list_revisions(
+                self.history_model_cls, self.id, page=page, size=size
+            )
+        total = len(self.revisions)
+        start = total - 1 - (page - 1) * size
+        revisions = []
+        for revision_id in range(start, max(start - size, -1), -1):
+            version = self.model.versions[revision_id]
+            revisions.append(DraftRevision(
+                None, self.id, revision_id, created=version.updated,
+                is_snapshot=True, document=dict(version.json or {}),
+            ))
+        return total, revisions
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Archival of the drafts in a terminal state."""
+
+from datetime import datetime
+
+import sqlalchemy as sa
+from elasticsearch.helpers import bulk
+from invenio_db import db
+from invenio_search import current_search_client
+from sqlalchemy.schema import DDL
+from sqlalchemy_continuum import ClassNotVersioned, version_class
+
+from .counters import counter_keys, draft_owners, update_counters
+from .types import CompressedJSONType
+
+
+def _month_range(when):
+    """Get the first day of the month of a date and of the next month."""
+    start = datetime(when.year, when.month, 1)
+    end = datetime(
+        start.year + start.month // 12, start.month % 12 + 1, 1
+    )
+    return start, end
+
+
+def ensure_archive_partition(archive_model_cls, when):
+    """Create the (PostgreSQL) archive partition of the month of a date."""
+    start, end = _month_range(when)
+    table = archive_model_cls.__table__
+    preparer = db.engine.dialect.identifier_preparer
+    db.session.execute(DDL(
+        "CREATE TABLE IF NOT EXISTS %(partition)s PARTITION OF %(table)s "
+        "FOR VALUES FROM (%(start)s) TO (%(end)s)",
+        context=dict(
+            partition=preparer.quote(
+                "{}_{:%Y%m}".format(table.name, start)
+            ),
+            table=preparer.format_table(table),
+            start="'{:%Y-%m-%d}'".format(start),
+            end="'{:%Y-%m-%d}'".format(end),
+        ),
+    ))
+
+
+def _version_table(model_cls):
+    """Get the SQLAlchemy-Continuum version table of a model, if any."""
+    try:
+        cls = version_class(model_cls)
+    except ClassNotVersioned:
+        return None
+    return None if cls is model_cls else cls.__table__
+
+
+def _copies_json(table, archive_table, dialect):
+    """Check if documents can be copied to the archive as stored, in SQL."""
+    types = (table.c.json.type, archive_table.c.json.type)
+    if any(isinstance(t, CompressedJSONType) for t in types):
+        return False
+    return len({t.compile(dialect=dialect) for t in types}) == 1
+
+
+def _delete_actions(indexer, documents):
+    """Get the bulk actions removing drafts from the search index."""
+    for id_, document in documents:
+        index, doc_type = indexer._prepare_index(
+            *indexer.record_to_index(document)
+        )
+        yield {
+            "_op_type": "delete",
+            "_index": index,
+            "_type": doc_type,
+            "_id": str(id_),
+        }
+
+
+def archive_drafts(model_cls, archive_model_cls, statuses,
+                   expired_before=None, batch_size=1000,
+                   counters_model_cls=None, history_model_cls=None,
+                   indexer=None):
+    """Move drafts from the drafts table to the archive table.
+
+    Drafts are moved in batches, each in its own transaction. Rows locked by
+    concurrent transactions are skipped (on PostgreSQL), and archived in a
+    later run. Their versions (SQLAlchemy-Continuum) are removed.
+
+    :param statuses: Statuses of the drafts to archive.
+    :param expired_before: Also archive the drafts which expired before this
+        date.
+    :param counters_model_cls: Per-owner counters to decrement.
+    :param history_model_cls: Revision history to remove the archived
+        drafts from.
+    :param indexer: Indexer to remove the archived drafts from the search
+        index with.
+    :returns: The number of archived drafts.
+    """
+    table = model_cls.__table__
+    condition = table.c.status.in_(statuses)
+    if expired_before:
+        condition = sa.or_(condition, table.c.expiry_date < expired_before)
+
+    archive_table = archive_model_cls.__table__
+    version_table = _version_table(model_cls)
+    columns = [c.name for c in table.columns]
+    in_sql = _copies_json(table, archive_table, db.engine.dialect)
+    total = 0
+    while True:
+        now = datetime.utcnow()
+        if db.engine.dialect.name == "postgresql":
+            ensure_archive_partition(archive_model_cls, now)
+        ids = [
+            row.id for row in db.session.query(model_cls.id).filter(
+                condition
+            ).limit(batch_size).with_for_update(skip_locked=True)
+        ]
+        if not ids:
+            db.session.commit()
+            return total
+
+        documents = []
+        if counters_model_cls is not None or indexer is not None:
+            archived = db.session.query(
+                model_cls.id, model_cls.status, model_cls.expiry_date,
+                model_cls.json,
+            ).filter(model_cls.id.in_(ids))
+            for id_, status, expiry_date, document in archived:
+                documents.append((id_, document or {}))
+                if counters_model_cls is not None:
+                    update_counters(counters_model_cls, counter_keys(
+                        draft_owners(document), status, expiry_date
+                    ), set())
+        if history_model_cls is not None:
+            db.session.execute(history_model_cls.__table__.delete().where(
+                history_model_cls.__table__.c.draft_id.in_(ids)
+            ))
+        if version_table is not None:
+            db.session.execute(version_table.delete().where(
+                version_table.c.id.in_(ids)
+            ))
+
+        if in_sql:
+            rows = sa.select(
+                [table.c[name] for name in columns] + [sa.literal(now)]
+            ).where(table.c.id.in_(ids))
+            db.session.execute(archive_table.insert().from_select(
+                columns + ["archived"], rows
+            ))
+        else:
+            # Documents go through Python to be converted between the
+            # column types.
+            rows = db.session.execute(sa.select(
+                [table.c[name] for name in columns]
+            ).where(table.c.id.in_(ids)))
+            db.session.execute(archive_table.insert(), [
+                dict(zip(columns, row), archived=now) for row in rows
+            ])
+        db.session.execute(table.delete().where(table.c.id.in_(ids)))
+        db.session.commit()
+        if indexer is not None:
+            # Drafts missing from the index are not an error.
+            bulk(current_search_client, _delete_actions(indexer, documents),
+                 raise_on_error=False, stats_only=True)
+        total += len(ids)
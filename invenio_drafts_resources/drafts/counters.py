@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Per-owner counters of the drafts.
+
+For each owner, the drafts are counted by status (``status:<status>``), by
+day of expiry (``expires:<YYYY-MM-DD>``) and, when reconciled, the drafts of
+records changed since the draft was forked (``stale``). Counters are
+updated incrementally when drafts are created, committed or deleted; the
+reconciliation recomputes them all, repairing any drift.
+"""
+
+from collections import Counter
+
+from invenio_db import db
+from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError
+
+
+def draft_owners(document):
+    """Get the owners (user ids) of a draft document."""
+    document = document or {}
+    owners = document.get("_owners") or []
+    if not owners and document.get("_created_by") is not None:
+        owners = [document["_created_by"]]
+    return [o for o in owners if isinstance(o, int)]
+
+
+def counter_keys(owners, status, expiry_date=None):
+    """Get the (owner id, counter) pairs counting a draft."""
+    counters = ["status:{}".format(status)]
+    if expiry_date is not None:
+        counters.append("expires:{:%Y-%m-%d}".format(expiry_date))
+    return {(owner, counter) for owner in owners for counter in counters}
+
+
+def _increment(model_cls, owner_id, counter, delta):
+    """Atomically add to a counter, creating it if needed."""
+    table = model_cls.__table__
+    update = table.update().where(and_(
+        table.c.owner_id == owner_id, table.c.counter == counter
+    )).values(count=table.c.count + delta)
+    if db.session.execute(update).rowcount:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.execute(table.insert().values(
+                owner_id=owner_id, counter=counter, count=delta
+            ))
+    except IntegrityError:
+        # Concurrently created.
+        db.session.execute(update)
+
+
+def update_counters(model_cls, before, after):
+    """Update the counters of a draft going from a state to another.
+
+    :param before: Counter keys (see :func:`counter_keys`) of the previous
+        state of the draft.
+    :param after: Counter keys of its new state.
+    """
+    for owner_id, counter in after - before:
+        _increment(model_cls, owner_id, counter, 1)
+    for owner_id, counter in before - after:
+        _increment(model_cls, owner_id, counter, -1)
+
+
+def get_counters(model_cls, owner_id):
+    """Get the non-zero counters of an owner, as a dict."""
+    rows = db.session.query(model_cls.counter, model_cls.count).filter(
+        model_cls.owner_id == owner_id, model_cls.count != 0
+    )
+    return dict(rows)
+
+
+def reconcile_counters(draft_cls, record_model_cls=None, chunk_size=1000):
+    """Recompute all the counters of a draft class.
+
+    :param record_model_cls: Model class of the records, to count the stale
+        drafts.
+    :returns: The number of counters.
+    """
+    model_cls = draft_cls.model_cls
+    stale = set()
+    if record_model_cls is not None:
+        stale = {
+            row.id for row in draft_cls.stale_query(record_model_cls)
+        }
+
+    counts = Counter()
+    query = db.session.query(
+        model_cls.id, model_cls.status, model_cls.expiry_date, model_cls.json
+    ).filter(model_cls.json != None).yield_per(chunk_size)  # noqa
+    for id_, status, expiry_date, document in query:
+        owners = draft_owners(document)
+        counts.update(counter_keys(owners, status, expiry_date))
+        if id_ in stale:
+            counts.update((owner, "stale") for owner in owners)
+
+    table = draft_cls.counters_model_cls.__table__
+    db.session.execute(table.delete())
+    if counts:
+        db.session.execute(table.insert(), [
+            dict(owner_id=owner_id, counter=counter, count=count)
+            for (owner_id, counter), count in counts.items()
+        ])
+    db.session.commit()
+    return len(counts)
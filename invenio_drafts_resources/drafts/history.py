@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Delta-encoded revision history of the drafts.
+
+Each revision of a draft is stored either as a full snapshot of the
+document (every ``snapshot_interval`` revisions) or as the JSON patch from
+the previous revision. A revision is rebuilt by applying to the closest
+previous snapshot the patches that follow it, so storage grows with the
+size of the edits rather than of the document.
+"""
+
+import jsonpatch
+from invenio_db import db
+
+
+def save_revision(model_cls, draft_id, revision_id, document, previous=None,
+                  snapshot_interval=20):
+    """Store a revision of a draft.
+
+    :param document: The document of the revision.
+    :param previous: The document of the previous revision (a snapshot is
+        stored if not given).
+    """
+    if previous is None or revision_id % snapshot_interval == 0:
+        snapshot, patch = dict(document), None
+    else:
+        snapshot = None
+        patch = jsonpatch.make_patch(dict(previous), dict(document)).patch
+    db.session.add(model_cls(
+        draft_id=draft_id, revision_id=revision_id, snapshot=snapshot,
+        patch=patch,
+    ))
+
+
+def materialize(model_cls, draft_id, revision_id):
+    """Rebuild the document of a draft revision.
+
+    :raises IndexError: If the revision does not exist, or cannot be
+        rebuilt because a patch is missing from the history.
+    """
+    snapshot_id = db.session.query(
+        db.func.max(model_cls.revision_id)
+    ).filter(
+        model_cls.draft_id == draft_id,
+        model_cls.revision_id <= revision_id,
+        model_cls.snapshot != None,  # noqa
+    ).scalar()
+    if snapshot_id is None:
+        raise IndexError("No revision {} of draft {}.".format(
+            revision_id, draft_id))
+
+    rows = model_cls.query.filter(
+        model_cls.draft_id == draft_id,
+        model_cls.revision_id >= snapshot_id,
+        model_cls.revision_id <= revision_id,
+    ).order_by(model_cls.revision_id).all()
+    if rows[-1].revision_id != revision_id:
+        raise IndexError("No revision {} of draft {}.".format(
+            revision_id, draft_id))
+    # A missing patch would silently give a wrong document.
+    if [row.revision_id for row in rows] != \
+            list(range(snapshot_id, revision_id + 1)):
+        raise IndexError(
+            "Revision {} of draft {} cannot be rebuilt, the history has "
+            "gaps.".format(revision_id, draft_id)
+        )
+
+    document = rows[0].snapshot
+    for row in rows[1:]:
+        document = jsonpatch.apply_patch(document, row.patch)
+    return document
+
+
+class DraftRevision(object):
+    """Revision of a draft, its document being rebuilt on first access."""
+
+    def __init__(self, model_cls, draft_id, revision_id, created=None,
+                 is_snapshot=False, document=None):
+        """Constructor.
+
+        :param document: The document, if already known.
+        """
+        self.model_cls = model_cls
+        self.draft_id = draft_id
+        self.revision_id = revision_id
+        self.created = created
+        self.is_snapshot = is_snapshot
+        self._document = document
+
+    @property
+    def document(self):
+        """The document of the revision."""
+        if self._document is None:
+            self._document = materialize(
+                self.model_cls, self.draft_id, self.revision_id
+            )
+        return self._document
+
+
+def list_revisions(model_cls, draft_id, page=1, size=10):
+    """List the revisions of a draft, latest first.
+
+    Only the revisions metadata is loaded, documents are rebuilt on access.
+
+    :returns: A tuple with the total number of revisions and the
+        :class:`DraftRevision` objects of the page.
+    """
+    query = db.session.query(
+        model_cls.revision_id,
+        model_cls.created,
+        (model_cls.snapshot != None).label("is_snapshot"),  # noqa
+    ).filter(model_cls.draft_id == draft_id)
+    total = query.count()
+    rows = query.order_by(model_cls.revision_id.desc()).offset(
+        (page - 1) * size
+    ).limit(size)
+    return total, [
+        DraftRevision(model_cls, draft_id, row.revision_id,
+                      created=row.created, is_snapshot=bool(row.is_snapshot))
+        for row in rows
+    ]
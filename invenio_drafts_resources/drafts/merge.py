@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Three-way merge of draft documents."""
+
+from jsonpointer import JsonPointer
+
+MISSING = object()
+"""Marker of a key absent from a document."""
+
+
+class MergeConflict(Exception):
+    """Both sides changed the same value differently."""
+
+    def __init__(self, paths):
+        """Constructor.
+
+        :param paths: JSON pointers of the conflicting values.
+        """
+        super(MergeConflict, self).__init__(
+            "Conflicting changes in: {}".format(", ".join(paths))
+        )
+        self.paths = paths
+
+
+def _merge(base, ours, theirs, path, conflicts):
+    """Merge one value, recursing into objects."""
+    if ours == theirs:
+        return ours
+    if ours == base:
+        return theirs
+    if theirs == base:
+        return ours
+
+    if isinstance(ours, dict) and isinstance(theirs, dict):
+        base = base if isinstance(base, dict) else {}
+        merged = {}
+        keys = list(ours) + [k for k in theirs if k not in ours]
+        keys += [k for k in base if k not in ours and k not in theirs]
+        for key in keys:
+            value = _merge(
+                base.get(key, MISSING),
+                ours.get(key, MISSING),
+                theirs.get(key, MISSING),
+                path + (key, ),
+                conflicts,
+            )
+            if value is not MISSING:
+                merged[key] = value
+        return merged
+
+    # Lists and scalars are merged as a whole.
+    conflicts.append(JsonPointer.from_parts(path).path)
+    return ours
+
+
+def three_way_merge(base, ours, theirs):
+    """Merge two documents derived from the same base document.
+
+    Changes made on one side only are kept, as well as identical changes on
+    both sides. Objects are merged key by key, lists and scalars as a whole.
+
+    :param base: The common ancestor document.
+    :param ours: Our modified document.
+    :param theirs: Their modified document.
+    :returns: The merged document.
+    :raises MergeConflict: If a value was changed differently on each side.
+    """
+    conflicts = []
+    merged = _merge(base, ours, theirs, (), conflicts)
+    if conflicts:
+        raise MergeConflict(conflicts)
+    return merged
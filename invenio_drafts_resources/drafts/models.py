@@ -34,7 +34,7 @@ class DraftMetadataBase(Timestamp):
     )
     """Draft identifier."""
 
-    fork_id = db.Column(UUIDType)
+    fork_id = db.Column(UUIDType, index=True)
     """Draft identifier, it is the same than the record it is draft of"""
 
     fork_version_id = db.Column(db.Integer)
@@ -76,3 +76,130 @@ class DraftMetadataBase(Timestamp):
     __mapper_args__ = {
         'version_id_col': version_id
     }
+
+
+class DraftArchiveMetadataBase(object):
+    """Represent a base class for archived draft metadata.
+
+    Drafts in a terminal state are moved out of the (hot) draft table to an
+    archive table with the same columns, plus the archival date. On
+    PostgreSQL the archive table is partitioned by month of archival.
+
+    The drafts table itself cannot be partitioned by status, since
+    PostgreSQL requires the partition key in the primary key, which is
+    referenced by the versions table.
+    """
+
+    __table_args__ = {"postgresql_partition_by": "RANGE (archived)"}
+
+    id = db.Column(UUIDType, primary_key=True)
+    """Draft identifier."""
+
+    archived = db.Column(
+        db.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"),
+        primary_key=True,
+        default=datetime.utcnow,
+    )
+    """When the draft was archived."""
+
+    created = db.Column(
+        db.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"),
+        nullable=False,
+    )
+    """Creation date of the draft."""
+
+    updated = db.Column(
+        db.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"),
+        nullable=False,
+    )
+    """Last update date of the draft."""
+
+    fork_id = db.Column(UUIDType, index=True)
+    """Id of the record the draft is a draft of."""
+
+    fork_version_id = db.Column(db.Integer)
+    """Version id of the record it is draft of."""
+
+    version_id = db.Column(db.Integer, nullable=False)
+    """Version id of the draft when archived."""
+
+    status = db.Column(db.String(255), nullable=False)
+    """Status of the draft when archived."""
+
+    expiry_date = db.Column(
+        db.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"),
+        nullable=True
+    )
+    """Expiry date of the draft."""
+
+    json = db.Column(
+        db.JSON().with_variant(
+            postgresql.JSONB(none_as_null=True),
+            'postgresql',
+        ).with_variant(
+            JSONType(),
+            'sqlite',
+        ).with_variant(
+            JSONType(),
+            'mysql',
+        ),
+        nullable=True
+    )
+    """Metadata of the draft."""
+
+
+class DraftRevisionMetadataBase(Timestamp):
+    """Represent a base class for the delta-encoded revisions of drafts.
+
+    A revision holds either a full ``snapshot`` of the draft document or the
+    JSON ``patch`` from the previous revision.
+    """
+
+    draft_id = db.Column(UUIDType, primary_key=True)
+    """Draft identifier."""
+
+    revision_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    """Revision of the draft."""
+
+    snapshot = db.Column(
+        db.JSON().with_variant(
+            postgresql.JSONB(none_as_null=True),
+            'postgresql',
+        ).with_variant(
+            JSONType(),
+            'sqlite',
+        ).with_variant(
+            JSONType(),
+            'mysql',
+        ),
+        nullable=True
+    )
+    """Full document of the revision, if it is a snapshot."""
+
+    patch = db.Column(
+        db.JSON().with_variant(
+            postgresql.JSONB(none_as_null=True),
+            'postgresql',
+        ).with_variant(
+            JSONType(),
+            'sqlite',
+        ).with_variant(
+            JSONType(),
+            'mysql',
+        ),
+        nullable=True
+    )
+    """JSON patch from the previous revision, if not a snapshot."""
+
+
+class DraftOwnerCounterBase(object):
+    """Represent a base class for the per-owner counters of drafts."""
+
+    owner_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    """Owner (user) identifier."""
+
+    counter = db.Column(db.String(255), primary_key=True)
+    """Name of the counter (e.g. ``status:draft``)."""
+
+    count = db.Column(db.Integer, nullable=False, default=0)
+    """Value of the counter."""
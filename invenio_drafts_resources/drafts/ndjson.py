@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Drafts export and import as newline-delimited JSON (NDJSON).
+
+Each line holds one draft model row: the draft ``id``, ``fork_id``,
+``fork_version_id``, ``version_id``, ``status``, ``expiry_date``, the
+``created``/``updated`` timestamps and the ``json`` document.
+
+Imports restore the same ids. They bypass the ORM (and thus the
+SQLAlchemy-Continuum version table) to insert rows in batches.
+"""
+
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+
+from invenio_db import db
+
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+COLUMNS = (
+    "id", "fork_id", "fork_version_id", "version_id", "status",
+    "expiry_date", "created", "updated", "json",
+)
+
+_UUID_COLUMNS = ("id", "fork_id")
+_DATETIME_COLUMNS = ("expiry_date", "created", "updated")
+
+
+def _dump_value(column, value):
+    """Convert a column value to its JSON representation."""
+    if value is None:
+        return None
+    if column in _UUID_COLUMNS:
+        return str(value)
+    if column in _DATETIME_COLUMNS:
+        return value.strftime(DATETIME_FORMAT)
+    return value
+
+
+def _load_value(column, value):
+    """Convert a JSON value back to its column value."""
+    if value is None:
+        return None
+    if column in _UUID_COLUMNS:
+        return uuid.UUID(value)
+    if column in _DATETIME_COLUMNS:
+        return datetime.strptime(value, DATETIME_FORMAT)
+    return value
+
+
+def export_drafts(model_cls, chunk_size=1000):
+    """Stream all the drafts of a model as NDJSON lines.
+
+    Rows are fetched as plain tuples ``chunk_size`` at a time (server-side
+    cursor on PostgreSQL), so memory usage does not depend on the number
+    of drafts.
+    """
+    columns = [getattr(model_cls, c) for c in COLUMNS]
+    query = db.session.query(*columns).order_by(model_cls.id)
+    for row in query.yield_per(chunk_size):
+        yield json.dumps({
+            c: _dump_value(c, v) for c, v in zip(COLUMNS, row)
+        }) + "\n"
+
+
+def _copy_rows(table, rows):
+    """Insert rows with PostgreSQL ``COPY``."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow([
+            json.dumps(row[c]) if c == "json" and row[c] is not None
+            else row[c]
+            for c in COLUMNS
+        ])
+    buf.seek(0)
+
+    cursor = db.session.connection().connection.cursor()
+    cursor.copy_expert(
+        "COPY {} ({}) FROM STDIN WITH (FORMAT csv)".format(
+            table.name, ", ".join(COLUMNS)
+        ),
+        buf,
+    )
+
+
+def _insert_rows(table, rows):
+    """Insert rows with an ``executemany`` insert."""
+    db.session.execute(table.insert(), rows)
+
+
+def import_drafts(model_cls, lines, batch_size=1000):
+    """Import NDJSON lines as produced by :func:`export_drafts`.
+
+    Rows are inserted in batches of ``batch_size``, using ``COPY`` on
+    PostgreSQL when the ``json`` column is a native JSON one, and committed
+    batch by batch. Other column types (e.g.
+    :class:`~invenio_drafts_resources.drafts.types.CompressedJSONType`) need
+    their own serialization, so they are inserted with ``executemany``.
+
+    The per-owner counters are not updated, reconcile them afterwards.
+
+    :returns: The number of imported drafts.
+    """
+    table = model_cls.__table__
+    dialect = db.engine.dialect
+    insert = _insert_rows
+    if dialect.name == "postgresql" and \
+            table.c.json.type.compile(dialect=dialect) in ("JSON", "JSONB"):
+        insert = _copy_rows
+
+    count = 0
+    batch = []
+    for line in lines:
+        if not line.strip():
+            continue
+        data = json.loads(line)
+        batch.append({c: _load_value(c, data.get(c)) for c in COLUMNS})
+        if len(batch) >= batch_size:
+            insert(table, batch)
+            db.session.commit()
+            count += len(batch)
+            batch = []
+    if batch:
+        insert(table, batch)
+        db.session.commit()
+        count += len(batch)
+    return count
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Compressed JSON column type.
+
+Large draft documents stored as text (and copied in the versions table on
+every save) compress well, especially with a dictionary trained on sample
+drafts. A draft model opts in by overriding its ``json`` column:
+
+.. code-block:: python
+
+    class MyDraftMetadata(db.Model, DraftMetadataBase):
+
+        __tablename__ = "my_drafts_metadata"
+
+        json = db.Column(
+            CompressedJSONType(codec="zstd", dictionary=load_dictionary),
+            default=lambda: dict(),
+            nullable=True,
+        )
+
+Documents are decompressed when the column is loaded, hence only on
+access for queries deferring it (see ``DraftBase.metadata_query``). The
+column can no longer be queried with JSON operators.
+"""
+
+import json
+import zlib
+from threading import Lock
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZLIB = b"z"
+ZLIB_DICT = b"d"
+ZSTD = b"s"
+
+
+def _dumps(document):
+    """Serialize a document compactly."""
+    return json.dumps(document, separators=(",", ":")).encode("utf-8")
+
+
+def train_dictionary(documents, size=16384):
+    """Train a compression dictionary on sample documents.
+
+    With ``zstandard`` installed a zstd dictionary is trained, which also
+    works as a (preset) zlib dictionary. Otherwise, the dictionary is made of
+    the samples themselves.
+
+    :param documents: Sample documents (dicts).
+    :param size: Max. size of the dictionary in bytes. zlib only uses the
+        last 32KB.
+    :returns: The dictionary bytes.
+    """
+    samples = [_dumps(d) for d in documents]
+    if zstandard is not None:
+        return zstandard.train_dictionary(size, samples).as_bytes()
+    # zlib matches better against the end of its dictionary.
+    return b"".join(samples)[-size:]
+
+
+class CompressedJSONType(TypeDecorator):
+    """JSON document stored compressed in a binary column.
+
+    Values are prefixed by the codec they were compressed with, so that the
+    codec can be changed without rewriting the existing rows. The dictionary
+    however must stay the same as long as rows compressed with it exist.
+    """
+
+    impl = LargeBinary
+
+    def __init__(self, codec="zlib", level=None, dictionary=None, *args,
+                 **kwargs):
+        """Constructor.
+
+        :param codec: ``zlib`` or ``zstd`` (requires ``zstandard``).
+        :param level: Compression level (default: the codec's default).
+        :param dictionary: Dictionary bytes, or a function returning them
+            (called on first use).
+        """
+        super(CompressedJSONType, self).__init__(*args, **kwargs)
+        if codec not in ("zlib", "zstd"):
+            raise ValueError("Unknown codec {}.".format(codec))
+        if codec == "zstd" and zstandard is None:
+            raise RuntimeError("The zstd codec requires zstandard.")
+        self.codec = codec
+        self.level = level
+        self._dictionary = dictionary
+        self._zstd_dictionary = None
+        self._lock = Lock()
+
+    @property
+    def dictionary(self):
+        """The dictionary bytes, if any."""
+        if callable(self._dictionary):
+            with self._lock:
+                if callable(self._dictionary):
+                    self._dictionary = self._dictionary()
+        return self._dictionary
+
+    @property
+    def zstd_dictionary(self):
+        """The dictionary prepared for zstd."""
+        if self._zstd_dictionary is None and self.dictionary:
+            self._zstd_dictionary = zstandard.ZstdCompressionDict(
+                self.dictionary
+            )
+        return self._zstd_dictionary
+
+    def compress(self, data):
+        """Compress bytes, prefixed by the codec."""
+        if self.codec == "zstd":
+            kwargs = {"dict_data": self.zstd_dictionary}
+            if self.level is not None:
+                kwargs["level"] = self.level
+            return ZSTD + zstandard.ZstdCompressor(**kwargs).compress(data)
+
+        level = -1 if self.level is None else self.level
+        if self.dictionary:
+            compressor = zlib.compressobj(level, zdict=self.dictionary)
+            return ZLIB_DICT + compressor.compress(data) + compressor.flush()
+        return ZLIB + zlib.compress(data, level)
+
+    def decompress(self, value):
+        """Decompress bytes according to their codec prefix."""
+        codec, payload = value[:1], value[1:]
+        if codec == ZLIB:
+            return zlib.decompress(payload)
+        if codec == ZLIB_DICT:
+            decompressor = zlib.decompressobj(zdict=self.dictionary)
+            return decompressor.decompress(payload) + decompressor.flush()
+        if codec == ZSTD:
+            if zstandard is None:
+                raise RuntimeError("Reading zstd values requires zstandard.")
+            return zstandard.ZstdDecompressor(
+                dict_data=self.zstd_dictionary
+            ).decompress(payload)
+        raise ValueError("Unknown compressed value prefix {!r}.".format(codec))
+
+    def process_bind_param(self, value, dialect):
+        """Serialize and compress a document."""
+        if value is None:
+            return None
+        return self.compress(_dumps(value))
+
+    def process_result_value(self, value, dialect):
+        """Decompress and deserialize a document."""
+        if value is None:
+            return None
+        return json.loads(self.decompress(bytes(value)).decode("utf-8"))
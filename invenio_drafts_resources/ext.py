@@ -9,20 +9,42 @@
 
 """Invenio Drafts Resources module to create REST APIs."""
 
+from threading import Lock
+
+from flask import current_app
+from invenio_base.utils import obj_or_import_string
+
 from . import config
+from .profiling import PhaseMetrics
+from .routing import ReadReplica
 
 
 class InvenioDraftsResources(object):
-    """Invenio-Drafts-Resources extension."""
+    """Invenio-Drafts-Resources extension.
+
+    Services and resources are registered by import path in
+    ``DRAFTS_RESOURCES_SERVICES`` and ``DRAFTS_RESOURCES_RESOURCES``, and only
+    imported and built on first use, so that processes not serving drafts
+    (e.g. CLI commands, workers) don't pay for it. Applications build the
+    blueprints from the registered resources, e.g.
+    ``ext.resource("draft").as_blueprint("draft_resource")``.
+    """
 
     def __init__(self, app=None):
         """Extension initialization."""
+        self._services = {}
+        self._resources = {}
+        self._ratelimit_backend = None
+        self._feed = None
+        self._lock = Lock()
         if app:
             self.init_app(app)
 
     def init_app(self, app):
         """Flask application initialization."""
         self.init_config(app)
+        self.metrics = PhaseMetrics()
+        self.init_read_replica(app)
         app.extensions["invenio-drafts-resources"] = self
 
     def init_config(self, app):
@@ -30,3 +52,66 @@ class InvenioDraftsResources(object):
         for k in dir(config):
             if k.startswith("DRAFTS_RESOURCES_"):
                 app.config.setdefault(k, getattr(config, k))
+        for k in ("DRAFTS_RESOURCES_RATELIMIT_USER",
+                  "DRAFTS_RESOURCES_RATELIMIT_DRAFT"):
+            limit = app.config[k]
+            if len(limit) != 2 or any(
+                    isinstance(v, bool) or not isinstance(v, (int, float)) or
+                    v <= 0 for v in limit):
+                raise ValueError(
+                    "{} must be a (rate, burst) pair of positive numbers, "
+                    "got {!r}.".format(k, limit)
+                )
+
+    def init_read_replica(self, app):
+        """Initialize the read replica, if configured."""
+        self.read_replica = None
+        uri = app.config["DRAFTS_RESOURCES_READ_REPLICA_URI"]
+        if uri:
+            pins_cls = obj_or_import_string(
+                app.config["DRAFTS_RESOURCES_READ_REPLICA_PINS"]
+            )
+            self.read_replica = ReadReplica(uri, pins_cls(app))
+            app.teardown_appcontext(self.read_replica.remove)
+
+    def _build_once(self, attr, config_key):
+        """Build an object configured by class or import path, once."""
+        if getattr(self, attr) is None:
+            with self._lock:
+                if getattr(self, attr) is None:
+                    cls = obj_or_import_string(current_app.config[config_key])
+                    setattr(self, attr, cls(current_app._get_current_object()))
+        return getattr(self, attr)
+
+    @property
+    def ratelimit_backend(self):
+        """Storage of the rate limits, built on first use."""
+        return self._build_once(
+            "_ratelimit_backend", "DRAFTS_RESOURCES_RATELIMIT_BACKEND"
+        )
+
+    @property
+    def feed(self):
+        """Pub/sub of the draft changes, built on first use."""
+        return self._build_once("_feed", "DRAFTS_RESOURCES_FEED_PUBSUB")
+
+    def _get(self, registry, config_key, name):
+        """Get an instance from a registry, building it on first use."""
+        instance = registry.get(name)
+        if instance is None:
+            with self._lock:
+                instance = registry.get(name)
+                if instance is None:
+                    cls = obj_or_import_string(
+                        current_app.config[config_key][name]
+                    )
+                    instance = registry[name] = cls()
+        return instance
+
+    def service(self, name):
+        """Get a service by name."""
+        return self._get(self._services, "DRAFTS_RESOURCES_SERVICES", name)
+
+    def resource(self, name):
+        """Get a resource by name."""
+        return self._get(self._resources, "DRAFTS_RESOURCES_RESOURCES", name)
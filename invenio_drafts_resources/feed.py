@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Change feed of the drafts.
+
+Every saved draft revision is published, with the JSON patch from the
+previous one, on the channel of the draft, and streamed to the subscribed
+clients as Server-Sent Events (``change`` events). Publishing the draft
+sends a ``publish`` event with the PID of its record.
+
+The pub/sub is given by ``DRAFTS_RESOURCES_FEED_PUBSUB``. The default one
+only delivers messages within the process; a shared one (e.g. on Redis)
+must implement the same ``subscribe``, ``publish`` and ``has_subscribers``
+methods for deployments with several processes.
+"""
+
+import json
+from collections import defaultdict
+from queue import Empty, Full, Queue
+from threading import Lock
+
+
+def feed_channel(draft):
+    """Channel of the changes of a draft.
+
+    It is keyed on the draft id, which unlike its record id (unknown for
+    new records until published) does not change.
+    """
+    return str(draft.id)
+
+
+class Subscription(object):
+    """Subscription of a client to a channel."""
+
+    def __init__(self, pubsub, channel, maxsize):
+        """Constructor."""
+        self.pubsub = pubsub
+        self.channel = channel
+        self._queue = Queue(maxsize=maxsize)
+
+    def put(self, message):
+        """Deliver a message, dropping the oldest one if full.
+
+        Clients detect the dropped messages by the gap in the revisions.
+        """
+        while True:
+            try:
+                self._queue.put_nowait(message)
+                return
+            except Full:
+                try:
+                    self._queue.get_nowait()
+                except Empty:
+                    pass
+
+    def get(self, timeout=None):
+        """Wait for a message, ``None`` on timeout."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def close(self):
+        """Unsubscribe."""
+        self.pubsub.unsubscribe(self)
+
+
+class InProcessPubSub(object):
+    """Pub/sub delivering messages within the process."""
+
+    def __init__(self, app=None, maxsize=100):
+        """Constructor.
+
+        :param maxsize: Max. number of pending messages per subscription.
+        """
+        self.maxsize = maxsize
+        self._subscriptions = defaultdict(set)
+        self._lock = Lock()
+
+    def subscribe(self, channel):
+        """Subscribe to a channel."""
+        subscription = Subscription(self, channel, self.maxsize)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a subscription."""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def has_subscribers(self, channel):
+        """Check if a channel has subscribers."""
+        with self._lock:
+            return channel in self._subscriptions
+
+    def publish(self, channel, message):
+        """Publish a message on a channel."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(message)
+
+
+def format_event(event, data, id_=None):
+    """Format a Server-Sent Event."""
+    lines = []
+    if id_ is not None:
+        lines.append("id: {}".format(id_))
+    lines.append("event: {}".format(event))
+    lines.append("data: {}".format(json.dumps(data)))
+    return "\n".join(lines) + "\n\n"
+
+
+def event_stream(subscription, revision_id, keepalive=15):
+    """Stream the messages of a subscription as Server-Sent Events.
+
+    It starts with the current revision, so that clients can tell whether
+    they missed changes, and sends comments as keep-alives.
+    """
+    try:
+        yield format_event("revision", {"revision_id": revision_id},
+                           id_=revision_id)
+        while True:
+            message = subscription.get(timeout=keepalive)
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            event = message.get("event", "change")
+            data = {k: v for k, v in message.items() if k != "event"}
+            yield format_event(event, data, id_=message["revision_id"])
+    finally:
+        subscription.close()
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Opt-in profiling of the drafts services and resources.
+
+When ``DRAFTS_RESOURCES_PROFILING_ENABLED`` is set, the time and number of
+database queries of each phase of a request to the draft resources
+(validation, database flush, commit, indexing, serialization) are
+recorded. They are sent back in the ``Server-Timing`` response header and
+aggregated in per-process metrics, exposed in the Prometheus text format
+to the identities with the ``report`` permission.
+
+Additionally, a fraction of the requests
+(``DRAFTS_RESOURCES_PROFILING_SAMPLE_RATE``) can be run under
+:mod:`cProfile`, the stats being dumped to
+``DRAFTS_RESOURCES_PROFILING_DIR``.
+"""
+
+import cProfile
+import os
+import random
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+
+from flask import current_app, g, has_app_context
+from invenio_db import db
+from sqlalchemy import event
+
+
+class RequestProfile(object):
+    """Timings and query counts of the phases of a request."""
+
+    def __init__(self):
+        """Constructor."""
+        self.phases = OrderedDict()
+        self.queries = 0
+        self.profiler = None
+
+    def add(self, phase, duration, queries):
+        """Record a phase, accumulating repeated ones."""
+        total_duration, total_queries = self.phases.get(phase, (0.0, 0))
+        self.phases[phase] = (
+            total_duration + duration, total_queries + queries
+        )
+
+    def server_timing(self):
+        """Format the phases as a ``Server-Timing`` header value."""
+        metrics = [
+            '{};dur={:.3f};desc="{} queries"'.format(
+                phase, duration * 1000, queries)
+            for phase, (duration, queries) in self.phases.items()
+        ]
+        metrics.append('db;desc="{} queries"'.format(self.queries))
+        return ", ".join(metrics)
+
+
+class PhaseMetrics(object):
+    """Per-process aggregation of the phase timings."""
+
+    buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+    def __init__(self):
+        """Constructor."""
+        self._lock = Lock()
+        self._phases = OrderedDict()
+
+    def observe(self, phase, duration, queries):
+        """Add an observation of a phase."""
+        with self._lock:
+            counts, total, count, total_queries = self._phases.get(
+                phase, ([0] * len(self.buckets), 0.0, 0, 0)
+            )
+            for i, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    counts[i] += 1
+            self._phases[phase] = (
+                counts, total + duration, count + 1, total_queries + queries
+            )
+
+    def render(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP drafts_phase_duration_seconds Duration of the request "
+            "phases.",
+            "# TYPE drafts_phase_duration_seconds histogram",
+        ]
+        with self._lock:
+            phases = list(self._phases.items())
+        for phase, (counts, total, count, _) in phases:
+            for bound, value in zip(self.buckets, counts):
+                lines.append(
+                    'drafts_phase_duration_seconds_bucket{{phase="{}",'
+                    'le="{}"}} {}'.format(phase, bound, value)
+                )
+            lines.extend([
+                'drafts_phase_duration_seconds_bucket{{phase="{}",'
+                'le="+Inf"}} {}'.format(phase, count),
+                'drafts_phase_duration_seconds_sum{{phase="{}"}} {}'.format(
+                    phase, total),
+                'drafts_phase_duration_seconds_count{{phase="{}"}} {}'.format(
+                    phase, count),
+            ])
+        lines.extend([
+            "# HELP drafts_phase_queries_total Database queries of the "
+            "request phases.",
+            "# TYPE drafts_phase_queries_total counter",
+        ])
+        for phase, (_, _, _, total_queries) in phases:
+            lines.append('drafts_phase_queries_total{{phase="{}"}} {}'.format(
+                phase, total_queries))
+        return "\n".join(lines) + "\n"
+
+
+def _current_profile():
+    """Get the profile of the current request, if profiling."""
+    if has_app_context():
+        return g.get("drafts_profile")
+    return None
+
+
+@contextmanager
+def timed(phase):
+    """Record the duration and database queries of a request phase.
+
+    It is a no-op unless profiling is enabled.
+    """
+    profile = _current_profile()
+    if profile is None:
+        yield
+        return
+
+    queries = profile.queries
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        duration = perf_counter() - start
+        queries = profile.queries - queries
+        profile.add(phase, duration, queries)
+        current_app.extensions["invenio-drafts-resources"].metrics.observe(
+            phase, duration, queries
+        )
+
+
+def _count_query(conn, cursor, statement, parameters, context,
+                 executemany):
+    """Count the queries of the current request."""
+    profile = _current_profile()
+    if profile is not None:
+        profile.queries += 1
+
+
+def start_profile():
+    """Start profiling the request (``before_request`` handler)."""
+    if not current_app.config["DRAFTS_RESOURCES_PROFILING_ENABLED"]:
+        return
+    engine = db.engine
+    if not event.contains(engine, "before_cursor_execute", _count_query):
+        event.listen(engine, "before_cursor_execute", _count_query)
+
+    g.drafts_profile = profile = RequestProfile()
+    rate = current_app.config["DRAFTS_RESOURCES_PROFILING_SAMPLE_RATE"]
+    if rate and random.random() < rate:
+        profile.profiler = cProfile.Profile()
+        profile.profiler.enable()
+
+
+def finish_profile(response):
+    """Add the profile to the response (``after_request`` handler)."""
+    profile = g.pop("drafts_profile", None)
+    if profile is None:
+        return response
+
+    if profile.profiler is not None:
+        profile.profiler.disable()
+        directory = (
+            current_app.config["DRAFTS_RESOURCES_PROFILING_DIR"] or
+            os.path.join(current_app.instance_path, "profiles")
+        )
+        os.makedirs(directory, exist_ok=True)
+        filename = "{}.prof".format(uuid.uuid4())
+        profile.profiler.dump_stats(os.path.join(directory, filename))
+        response.headers["X-Drafts-Profile"] = filename
+
+    if profile.phases:
+        response.headers["Server-Timing"] = profile.server_timing()
+    return response
+
+
+def init_profiling(blueprint):
+    """Register the profiling hooks on the blueprint of a resource."""
+    blueprint.before_request(start_profile)
+    blueprint.after_request(finish_profile)
+    return blueprint
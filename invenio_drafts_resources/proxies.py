@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Proxies for accessing the current drafts resources extension."""
+
+from flask import current_app
+from werkzeug.local import LocalProxy
+
+current_drafts_resources = LocalProxy(
+    lambda: current_app.extensions["invenio-drafts-resources"]
+)
+"""Proxy for the instantiated drafts resources extension."""
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Rate limiting of the draft writes.
+
+When ``DRAFTS_RESOURCES_RATELIMIT_ENABLED`` is set, writes are limited by
+token buckets, one per user (or client address for anonymous users) and
+one per record PID, with the rate and burst set in
+``DRAFTS_RESOURCES_RATELIMIT_USER`` and ``DRAFTS_RESOURCES_RATELIMIT_DRAFT``.
+The buckets are kept by the backend given in
+``DRAFTS_RESOURCES_RATELIMIT_BACKEND``: in the memory of each process by
+default, or in Redis to share them between processes and hosts.
+"""
+
+import math
+import time
+from functools import wraps
+from threading import Lock
+
+from flask import current_app, g, request
+from flask_resources.context import resource_requestctx
+from invenio_rest.errors import RESTException
+
+from .proxies import current_drafts_resources
+from .utils import LRUCache
+
+
+class RateLimitExceededError(RESTException):
+    """Too many requests."""
+
+    code = 429
+    description = "Too many requests, please retry later."
+
+    def __init__(self, retry_after, **kwargs):
+        """Constructor.
+
+        :param retry_after: Seconds to wait before retrying.
+        """
+        super(RateLimitExceededError, self).__init__(**kwargs)
+        self.retry_after = retry_after
+
+    def get_headers(self, *args, **kwargs):
+        """Get the response headers, with ``Retry-After``."""
+        headers = super(RateLimitExceededError, self).get_headers(
+            *args, **kwargs
+        )
+        return headers + [
+            ("Retry-After", str(int(math.ceil(self.retry_after))))
+        ]
+
+
+class MemoryBackend(object):
+    """Token buckets in the memory of the process."""
+
+    def __init__(self, app=None, maxsize=100000):
+        """Constructor.
+
+        :param maxsize: Max. number of buckets, the least recently used ones
+            being dropped (i.e. refilled).
+        """
+        self._buckets = LRUCache(maxsize=maxsize)
+        self._lock = Lock()
+
+    def consume(self, key, rate, burst):
+        """Take a token from a bucket.
+
+        :param rate: Tokens added per second.
+        :param burst: Size of the bucket.
+        :returns: ``0`` if a token was taken, otherwise the seconds to wait
+            for one.
+        """
+        return self.consume_all([(key, rate, burst)])
+
+    def consume_all(self, limits):
+        """Take a token from each of several buckets, or from none.
+
+        :param limits: List of ``(key, rate, burst)`` of the buckets.
+        :returns: ``0`` if the tokens were taken, otherwise the seconds to
+            wait for all the buckets to have one.
+        """
+        now = time.monotonic()
+        with self._lock:
+            buckets = []
+            for key, rate, burst in limits:
+                tokens, last = self._buckets.get(key, (burst, now))
+                buckets.append(
+                    (key, min(burst, tokens + (now - last) * rate), rate)
+                )
+            wait = max(
+                max(0, 1 - tokens) / rate for _, tokens, rate in buckets
+            )
+            taken = 0 if wait else 1
+            for key, tokens, _ in buckets:
+                self._buckets.set(key, (tokens - taken, now))
+        return wait
+
+
+class RedisBackend(object):
+    """Token buckets shared through Redis.
+
+    It connects to ``DRAFTS_RESOURCES_RATELIMIT_STORAGE_URL`` (by default
+    ``CACHE_REDIS_URL``).
+    """
+
+    script = """
+        local now = tonumber(ARGV[1])
+        local wait = 0
+        local buckets = {}
+        for i, key in ipairs(KEYS) do
+            local rate = tonumber(ARGV[2 * i])
+            local burst = tonumber(ARGV[2 * i + 1])
+            local tokens = tonumber(redis.call('HGET', key, 'tokens'))
+            local last = tonumber(redis.call('HGET', key, 'last'))
+            if tokens == nil then
+                tokens = burst
+                last = now
+            end
+            tokens = math.min(burst, tokens + math.max(0, now - last) * rate)
+            if tokens < 1 then
+                wait = math.max(wait, (1 - tokens) / rate)
+            end
+            buckets[i] = {tokens, math.ceil(burst / rate) + 1}
+        end
+        for i, key in ipairs(KEYS) do
+            local tokens = buckets[i][1]
+            if wait == 0 then
+                tokens = tokens - 1
+            end
+            redis.call('HSET', key, 'tokens', tostring(tokens))
+            redis.call('HSET', key, 'last', tostring(now))
+            redis.call('EXPIRE', key, buckets[i][2])
+        end
+        return tostring(wait)
+    """
+
+    def __init__(self, app):
+        """Constructor."""
+        from redis import StrictRedis
+
+        url = app.config["DRAFTS_RESOURCES_RATELIMIT_STORAGE_URL"] or \
+            app.config.get("CACHE_REDIS_URL", "redis://localhost:6379/0")
+        self.client = StrictRedis.from_url(url)
+        self._consume = self.client.register_script(self.script)
+
+    def consume(self, key, rate, burst):
+        """Take a token from a bucket (see :meth:`MemoryBackend.consume`)."""
+        return self.consume_all([(key, rate, burst)])
+
+    def consume_all(self, limits):
+        """Take a token from each of several buckets, or from none.
+
+        See :meth:`MemoryBackend.consume_all`.
+        """
+        args = [time.time()]
+        for _, rate, burst in limits:
+            args.extend((rate, burst))
+        return float(self._consume(
+            keys=["drafts-ratelimit:{}".format(key) for key, _, _ in limits],
+            args=args,
+        ))
+
+
+def throttle(pid_value=None):
+    """Take a write token of the current user and of the record PID.
+
+    Tokens are only taken if both buckets have one, so that requests
+    denied by one bucket do not drain the other.
+
+    :raises RateLimitExceededError: If one of the buckets is empty.
+    """
+    config = current_app.config
+    if not config["DRAFTS_RESOURCES_RATELIMIT_ENABLED"]:
+        return
+
+    identity = g.get("identity")
+    user = getattr(identity, "id", None) or request.remote_addr
+    rate, burst = config["DRAFTS_RESOURCES_RATELIMIT_USER"]
+    limits = [("user:{}".format(user), rate, burst)]
+    if pid_value is not None:
+        rate, burst = config["DRAFTS_RESOURCES_RATELIMIT_DRAFT"]
+        limits.append(("draft:{}".format(pid_value), rate, burst))
+
+    wait = current_drafts_resources.ratelimit_backend.consume_all(limits)
+    if wait:
+        raise RateLimitExceededError(retry_after=wait)
+
+
+def rate_limited(f):
+    """Rate limit a resource method writing a draft."""
+    @wraps(f)
+    def inner(*args, **kwargs):
+        throttle(resource_requestctx.route.get("pid_value"))
+        return f(*args, **kwargs)
+    return inner
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Parallel full reindexing of drafts.
+
+The draft table is split in id (UUID) ranges. Each range is streamed and
+indexed into a new index by a worker process, with the indexer of the
+drafts service. Once all ranges are indexed, the drafts written since the
+reindex started are indexed again (see :func:`catch_up`) and the alias is
+atomically moved to the new index.
+
+Progress is persisted in a state file after each range, so that an
+interrupted reindex can be resumed.
+"""
+
+import json
+import multiprocessing
+import os
+import uuid
+from datetime import datetime
+
+from elasticsearch.exceptions import NotFoundError
+from flask import current_app
+from invenio_db import db
+from invenio_search import current_search_client
+
+_app = None
+"""Application shared with the forked worker processes."""
+
+_SINCE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def uuid_partitions(count):
+    """Split the UUID space in ``count`` contiguous ranges.
+
+    :returns: A list of ``(lower, upper)`` tuples. The lower bound is
+        inclusive and the upper bound exclusive (``None`` for the last one).
+    """
+    step = 2 ** 128 // count
+    bounds = [uuid.UUID(int=i * step) for i in range(count)] + [None]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def new_index_name(alias):
+    """Name of a new timestamped index for an alias."""
+    return "{}-{}".format(alias, datetime.utcnow().strftime("%Y%m%d%H%M%S"))
+
+
+def create_index(alias, index, mapping=None):
+    """Create an index with the given or the alias' current mapping."""
+    if mapping is None:
+        current = current_search_client.indices.get(alias)
+        current = next(iter(current.values()))
+        settings = current["settings"]["index"]
+        for key in ("uuid", "creation_date", "version", "provided_name"):
+            settings.pop(key, None)
+        mapping = {
+            "mappings": current["mappings"],
+            "settings": {"index": settings},
+        }
+    current_search_client.indices.create(index=index, body=mapping)
+
+
+def target_indexer(indexer_cls, index):
+    """Build an indexer writing to the given index instead of the alias.
+
+    :param indexer_cls: Indexer class of the service, built with a
+        ``record_to_index`` function.
+    :param index: Index name, with its prefix.
+    """
+    prefix = current_app.config.get("SEARCH_INDEX_PREFIX") or ""
+    # The indexer prefixes the index names itself.
+    if prefix and index.startswith(prefix):
+        index = index[len(prefix):]
+    indexer = indexer_cls()
+
+    def record_to_index(record):
+        return index, indexer.record_to_index(record)[1]
+
+    return indexer_cls(record_to_index=record_to_index)
+
+
+def swap_alias(alias, index):
+    """Atomically point the alias to the index only."""
+    actions = [{"add": {"index": index, "alias": alias}}]
+    if current_search_client.indices.exists_alias(name=alias):
+        for old_index in current_search_client.indices.get_alias(name=alias):
+            actions.insert(
+                0, {"remove": {"index": old_index, "alias": alias}}
+            )
+    current_search_client.indices.update_aliases(body={"actions": actions})
+
+
+class ReindexState(object):
+    """Reindex progress persisted as a JSON file."""
+
+    def __init__(self, path, alias=None, index=None, partitions=None,
+                 done=None, since=None):
+        """Constructor.
+
+        :param since: Start of the reindex (or of the last catch-up), as
+            an ISO timestamp (UTC).
+        """
+        self.path = path
+        self.alias = alias
+        self.index = index
+        self.partitions = partitions
+        self.done = set(done or [])
+        self.since = since or datetime.utcnow().strftime(_SINCE_FORMAT)
+
+    @classmethod
+    def load(cls, path):
+        """Load the state from its file."""
+        with open(path) as fp:
+            return cls(path, **json.load(fp))
+
+    def save(self):
+        """Atomically write the state to its file."""
+        tmp_path = "{}.tmp".format(self.path)
+        with open(tmp_path, "w") as fp:
+            json.dump(dict(
+                alias=self.alias,
+                index=self.index,
+                partitions=self.partitions,
+                done=sorted(self.done),
+                since=self.since,
+            ), fp)
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        """Remove the state file."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _init_worker():
+    """Set up a forked worker with its own database connections."""
+    _app.app_context().push()
+    # Connections inherited from the parent process must not be reused.
+    db.engine.dispose()
+
+
+def _drafts(draft_cls, query, chunk_size):
+    """Stream the drafts of a model query."""
+    for model in query.yield_per(chunk_size):
+        yield draft_cls(model.json, model=model)
+
+
+def reindex_partition(args):
+    """Index the drafts of one id range.
+
+    :returns: A tuple with the partition number and the indexed drafts.
+    """
+    number, draft_cls, indexer_cls, index, lower, upper, chunk_size = args
+    model_cls = draft_cls.model_cls
+    query = model_cls.query.filter(model_cls.json != None)  # noqa
+    query = query.filter(model_cls.id >= lower)
+    if upper is not None:
+        query = query.filter(model_cls.id < upper)
+
+    indexer = target_indexer(indexer_cls, index)
+    count = 0
+    try:
+        for draft in _drafts(draft_cls, query, chunk_size):
+            indexer.index(draft)
+            count += 1
+    finally:
+        db.session.remove()
+    return number, count
+
+
+def catch_up(draft_cls, indexer_cls, state, chunk_size=500):
+    """Index again the drafts written since the reindex (or last catch-up).
+
+    Drafts deleted since then are removed from the new index. It is run
+    before and after the alias is swapped, the writes in between being
+    made to the old index.
+
+    :returns: The number of indexed or removed drafts.
+    """
+    since = datetime.strptime(state.since, _SINCE_FORMAT)
+    state.since = datetime.utcnow().strftime(_SINCE_FORMAT)
+    model_cls = draft_cls.model_cls
+    query = model_cls.query.filter(model_cls.updated >= since)
+
+    indexer = target_indexer(indexer_cls, state.index)
+    count = 0
+    for draft in _drafts(draft_cls, query, chunk_size):
+        if draft.model.json is None:
+            try:
+                indexer.delete(draft)
+            except NotFoundError:
+                pass
+        else:
+            indexer.index(draft)
+        count += 1
+    state.save()
+    return count
+
+
+def reindex(draft_cls, indexer_cls, state, processes=None, chunk_size=500):
+    """Reindex the pending partitions of a state in a process pool.
+
+    :param indexer_cls: Indexer class of the drafts service.
+
+    :returns: An iterator of ``(partition number, indexed drafts)`` tuples,
+        in completion order.
+    """
+    global _app
+    _app = current_app._get_current_object()
+
+    tasks = [
+        (number, draft_cls, indexer_cls, state.index, lower, upper,
+         chunk_size)
+        for number, (lower, upper)
+        in enumerate(uuid_partitions(state.partitions))
+        if number not in state.done
+    ]
+    # Workers are forked so that they inherit the application, but they
+    # must not share the parent database connections.
+    db.session.remove()
+    db.engine.dispose()
+    pool = multiprocessing.get_context("fork").Pool(
+        processes=processes, initializer=_init_worker,
+    )
+    try:
+        for number, count in pool.imap_unordered(reindex_partition, tasks):
+            state.done.add(number)
+            state.save()
+            yield number, count
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
@@ -17,10 +17,70 @@ class IdentifiedRecordDraft(IdentifiedRecord):
 
     Since a draft can be created for a non-existing record,
     it might not have a PID.
+
+    Its attributes are kept in ``__slots__``, since listing and bulk
+    operations create many units.
     """
 
-    def __init__(self, pid=None, record=None):
-        """Initialize the record state."""
+    __slots__ = ("id", "pid", "record", "stale")
+
+    def __init__(self, pid=None, record=None, stale=None):
+        """Initialize the record state.
+
+        :param stale: If the record moved past the revision the draft was
+            forked from (`None` if unknown).
+        """
         self.id = pid.pid_value if pid else None
-        self.pids = [pid] if pid else []
+        self.pid = pid
         self.record = record
+        self.stale = stale
+
+    @property
+    def pids(self):
+        """List of PIDs of the unit."""
+        return [self.pid] if self.pid else []
+
+    def is_revision(self, revision_id):
+        """Check if record is in a specific revision."""
+        return str(self.record.revision_id) == str(revision_id)
+
+
+class DraftProjection(object):
+    """Lightweight resource unit with only the draft model columns.
+
+    It carries no JSON document, hence it is suited for listings, status
+    polls and sweeps over many drafts.
+    """
+
+    __slots__ = (
+        "id", "draft_id", "revision_id", "status", "expiry_date",
+        "created", "updated",
+    )
+
+    def __init__(self, id=None, draft_id=None, revision_id=None,
+                 status=None, expiry_date=None, created=None, updated=None):
+        """Initialize the projection."""
+        self.id = id
+        self.draft_id = draft_id
+        self.revision_id = revision_id
+        self.status = status
+        self.expiry_date = expiry_date
+        self.created = created
+        self.updated = updated
+
+    @classmethod
+    def from_model(cls, model, pid=None):
+        """Create a projection from a draft model instance (or row)."""
+        return cls(
+            id=pid.pid_value if pid else None,
+            draft_id=model.id,
+            revision_id=model.version_id - 1,
+            status=model.status,
+            expiry_date=model.expiry_date,
+            created=model.created,
+            updated=model.updated,
+        )
+
+    def is_revision(self, revision_id):
+        """Check if the draft is in a specific revision."""
+        return str(self.revision_id) == str(revision_id)
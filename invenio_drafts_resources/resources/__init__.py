@@ -9,21 +9,32 @@
 
 """Invenio Drafts Resources module to create REST APIs."""
 
-from .deposit import DepositResource, DepositResourceConfig
+from .deposit import DepositCountersResource, DepositCountersResourceConfig, \
+    DepositResource, DepositResourceConfig
 from .draft import DraftActionResource, DraftActionResourceConfig, \
-    DraftResource, DraftResourceConfig, DraftVersionResource, \
-    DraftVersionResourceConfig
+    DraftAutosaveResource, DraftAutosaveResourceConfig, DraftDiffResource, \
+    DraftDiffResourceConfig, DraftPublishJobResource, \
+    DraftPublishJobResourceConfig, DraftResource, DraftResourceConfig, \
+    DraftVersionResource, DraftVersionResourceConfig
 from .draft_file import DraftFileActionResource, \
     DraftFileActionResourceConfig, DraftFileResource, \
     DraftFileResourceConfig
 
 __all__ = (
+    "DepositCountersResource",
+    "DepositCountersResourceConfig",
     "DepositResource",
     "DepositResourceConfig",
     "DraftResource",
     "DraftResourceConfig",
     "DraftActionResource",
     "DraftActionResourceConfig",
+    "DraftAutosaveResource",
+    "DraftAutosaveResourceConfig",
+    "DraftDiffResource",
+    "DraftDiffResourceConfig",
+    "DraftPublishJobResource",
+    "DraftPublishJobResourceConfig",
     "DraftVersionResource",
     "DrafVersiontResourceConfig",
     "DraftFileActionResourceConfig",
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Base classes of the draft resources."""
+
+from ..profiling import init_profiling
+from ..proxies import current_drafts_resources
+
+
+class ProfilingMixin(object):
+    """Resource whose requests are profiled, when profiling is enabled.
+
+    See :mod:`invenio_drafts_resources.profiling`.
+    """
+
+    def as_blueprint(self, name, **bp_kwargs):
+        """Create the blueprint, with the profiling hooks."""
+        return init_profiling(
+            super(ProfilingMixin, self).as_blueprint(name, **bp_kwargs)
+        )
+
+
+class LazyServiceMixin(object):
+    """Resource whose default service is taken from the extension.
+
+    The service is only looked up on first access, i.e. when serving the
+    first request rather than when creating the blueprint.
+    """
+
+    default_service = None
+    """Name of the default service in ``DRAFTS_RESOURCES_SERVICES``."""
+
+    @property
+    def service(self):
+        """The service of the resource."""
+        if self._service is None:
+            self._service = current_drafts_resources.service(
+                self.default_service
+            )
+        return self._service
+
+    @service.setter
+    def service(self, value):
+        """Set the service of the resource."""
+        self._service = value
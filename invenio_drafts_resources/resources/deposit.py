@@ -9,9 +9,12 @@
 
 """Invenio Deposits Resources."""
 
-from flask_resources import CollectionResource
+from flask import g
+from flask_resources import CollectionResource, SingletonResource
 from flask_resources.resources import ResourceConfig
 
+from .base import LazyServiceMixin, ProfilingMixin
+
 # TODO: Get rid of them when implementation is done
 STUB_ITEM_RESULT = ({"TODO": "IMPLEMENT ME"}, 200)
 STUB_LIST_RESULT = ([{"TODO": "IMPLEMENT ME"}], 200)
@@ -25,7 +28,7 @@ class DepositResourceConfig(ResourceConfig):
     list_route = "/user/records"
 
 
-class DepositResource(CollectionResource):
+class DepositResource(ProfilingMixin, CollectionResource):
     """Deposit resource."""
 
     default_config = DepositResourceConfig
@@ -33,3 +36,26 @@ class DepositResource(CollectionResource):
     def search(self, *args, **kwargs):
         """Perform a search over the items."""
         return STUB_LIST_RESULT
+
+
+class DepositCountersResourceConfig(ResourceConfig):
+    """Deposit counters resource config."""
+
+    list_route = "/user/records/counters"
+
+
+class DepositCountersResource(ProfilingMixin, LazyServiceMixin,
+                              SingletonResource):
+    """Dashboard counters of the drafts of the current user."""
+
+    default_config = DepositCountersResourceConfig
+    default_service = "draft"
+
+    def __init__(self, service=None, *args, **kwargs):
+        """Constructor."""
+        super(DepositCountersResource, self).__init__(*args, **kwargs)
+        self.service = service
+
+    def read(self, *args, **kwargs):
+        """Read the counters."""
+        return self.service.owner_counters(g.identity), 200
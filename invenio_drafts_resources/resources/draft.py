@@ -9,43 +9,68 @@
 
 """Invenio Drafts Resources module to create REST APIs."""
 
-from flask import g
+from flask import current_app, g, request
 from flask_resources import CollectionResource, SingletonResource
 from flask_resources.context import resource_requestctx
+from flask_resources.parsers import ArgsParser
 from flask_resources.resources import ResourceConfig
-from invenio_records_resources.responses import RecordResponse
+from webargs import fields
 
+from ..ratelimit import rate_limited
+from ..responses import DraftResponse
 from ..serializers import DraftJSONSerializer
-from ..services import DraftVersionService, RecordDraftService
 from ..services.schemas import DraftSchemaJSONV1
+from .base import LazyServiceMixin, ProfilingMixin
+
+
+def _if_match_revision():
+    """Get the revision id of the ``If-Match`` request header, if any."""
+    etag = request.headers.get("If-Match", "").strip()
+    if etag.startswith("W/"):
+        etag = etag[2:]
+    try:
+        return int(etag.strip('"'))
+    except ValueError:
+        return None
+
+
+# Selection of the response fields, e.g. ``?fields=status,metadata.title``
+fields_args_parser = ArgsParser({
+    "fields": fields.DelimitedList(fields.Str()),
+})
 
 
 class DraftResourceConfig(ResourceConfig):
     """Draft resource config."""
 
     list_route = "/records/<pid_value>/draft"
+    request_url_args_parser = fields_args_parser
     response_handlers = {
-        "application/json": RecordResponse(
+        "application/json": DraftResponse(
             DraftJSONSerializer(schema=DraftSchemaJSONV1)
         )
     }
 
 
-class DraftResource(SingletonResource):
+class DraftResource(ProfilingMixin, LazyServiceMixin, SingletonResource):
     """Draft resource."""
 
     default_config = DraftResourceConfig
+    default_service = "draft"
 
     def __init__(self, service=None, *args, **kwargs):
         """Constructor."""
         super(DraftResource, self).__init__(*args, **kwargs)
-        self.service = service or RecordDraftService()
+        self.service = service
 
     def read(self, *args, **kwargs):
         """Read an item."""
-        # TODO: IMPLEMENT ME!
-        return self.service.read(), 200
+        identity = g.identity
+        id_ = resource_requestctx.route["pid_value"]
+
+        return self.service.read_draft(id_, identity), 200
 
+    @rate_limited
     def create(self, *args, **kwargs):
         """Create an item."""
         data = resource_requestctx.request_content
@@ -54,10 +79,20 @@ class DraftResource(SingletonResource):
 
         return self.service.edit(id_, data, identity), 201
 
+    @rate_limited
     def update(self, *args, **kwargs):
-        """Update an item."""
-        # TODO: IMPLEMENT ME!
-        return self.service.update(), 200
+        """Update an item.
+
+        The ``If-Match`` header tells on which revision the changes are
+        based, so that concurrent changes can be merged.
+        """
+        data = resource_requestctx.request_content
+        identity = g.identity
+        id_ = resource_requestctx.route["pid_value"]
+
+        return self.service.update(
+            id_, data, identity, revision_id=_if_match_revision()
+        ), 200
 
     def delete(self, *args, **kwargs):
         """Delete an item."""
@@ -65,21 +100,82 @@ class DraftResource(SingletonResource):
         return self.service.delete(), 200
 
 
+class DraftAutosaveResourceConfig(DraftResourceConfig):
+    """Draft autosave resource config."""
+
+    list_route = "/records/<pid_value>/draft/autosave"
+
+
+class DraftAutosaveResource(ProfilingMixin, LazyServiceMixin,
+                            SingletonResource):
+    """Batches of field edits over a draft, saved at once."""
+
+    default_config = DraftAutosaveResourceConfig
+    default_service = "draft"
+
+    def __init__(self, service=None, *args, **kwargs):
+        """Constructor."""
+        super(DraftAutosaveResource, self).__init__(*args, **kwargs)
+        self.service = service
+
+    @rate_limited
+    def create(self, *args, **kwargs):
+        """Save a batch of edits.
+
+        The body is a list of JSON patch operations with client timestamps,
+        made over the revision given in the ``If-Match`` header.
+        """
+        edits = resource_requestctx.request_content
+        identity = g.identity
+        id_ = resource_requestctx.route["pid_value"]
+
+        return self.service.autosave(
+            id_, edits, identity, revision_id=_if_match_revision()
+        ), 200
+
+
+class DraftDiffResourceConfig(ResourceConfig):
+    """Draft diff resource config."""
+
+    list_route = "/records/<pid_value>/draft/diff"
+
+
+class DraftDiffResource(ProfilingMixin, LazyServiceMixin, SingletonResource):
+    """Changes of a draft over the record it is a draft of."""
+
+    default_config = DraftDiffResourceConfig
+    default_service = "draft"
+
+    def __init__(self, service=None, *args, **kwargs):
+        """Constructor."""
+        super(DraftDiffResource, self).__init__(*args, **kwargs)
+        self.service = service
+
+    def read(self, *args, **kwargs):
+        """Read the diff."""
+        identity = g.identity
+        id_ = resource_requestctx.route["pid_value"]
+
+        return self.service.diff(id_, identity), 200
+
+
 class DraftVersionResourceConfig(ResourceConfig):
     """Draft resource config."""
 
     list_route = "/records/<pid_value>/versions"
 
 
-class DraftVersionResource(CollectionResource):
+class DraftVersionResource(ProfilingMixin, LazyServiceMixin,
+                           CollectionResource):
     """Draft version resource."""
 
     default_config = DraftVersionResourceConfig
+    default_service = "draft_version"
 
     def __init__(self, service=None, *args, **kwargs):
         """Constructor."""
         super(DraftVersionResource, self).__init__(*args, **kwargs)
-        self.service = service or DraftVersionService()
+        self.service = service
 
     def search(self, *args, **kwargs):
         """Perform a search over the items."""
@@ -98,18 +194,63 @@ class DraftActionResourceConfig(ResourceConfig):
     list_route = "/records/<pid_value>/draft/actions/<action>"
 
 
-class DraftActionResource(SingletonResource):
+class DraftActionResource(ProfilingMixin, LazyServiceMixin, SingletonResource):
     """Draft action resource."""
 
     default_config = DraftActionResourceConfig
+    default_service = "draft"
 
     def __init__(self, service=None, *args, **kwargs):
         """Constructor."""
         super(DraftActionResource, self).__init__(*args, **kwargs)
-        self.service = service or RecordDraftService()
+        self.service = service
 
     def create(self, *args, **kwargs):
         """Any POST business logic."""
         if resource_requestctx.route["action"] == "publish":
-            return self.service.publish()
+            return self.publish()
         return {}, 200
+
+    def publish(self):
+        """Publish the draft.
+
+        Heavy publishes can run in the background (see
+        ``DRAFTS_RESOURCES_PUBLISH_BACKGROUND``, or the ``Prefer:
+        respond-async`` header), returning the publish job to poll.
+        """
+        identity = g.identity
+        id_ = resource_requestctx.route["pid_value"]
+
+        prefer = request.headers.get("Prefer", "")
+        if current_app.config["DRAFTS_RESOURCES_PUBLISH_BACKGROUND"] or \
+                "respond-async" in prefer:
+            return self.service.publish_in_background(id_, identity), 202
+
+        record = self.service.publish(id_, identity)
+        return dict(pid=record.id, revision=record.record.revision_id), 200
+
+
+class DraftPublishJobResourceConfig(ResourceConfig):
+    """Draft publish job resource config."""
+
+    list_route = "/drafts/publish-jobs/<job_id>"
+
+
+class DraftPublishJobResource(ProfilingMixin, LazyServiceMixin,
+                              SingletonResource):
+    """State of a background publish."""
+
+    default_config = DraftPublishJobResourceConfig
+    default_service = "draft"
+
+    def __init__(self, service=None, *args, **kwargs):
+        """Constructor."""
+        super(DraftPublishJobResource, self).__init__(*args, **kwargs)
+        self.service = service
+
+    def read(self, *args, **kwargs):
+        """Read the state of the job."""
+        identity = g.identity
+        job_id = resource_requestctx.route["job_id"]
+
+        return self.service.publish_status(job_id, identity), 200
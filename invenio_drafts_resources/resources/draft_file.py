@@ -14,7 +14,7 @@ from flask_resources.context import resource_requestctx
 # TODO: expose correctly in flask-resources
 from flask_resources.resources import ResourceConfig
 
-from ..services import DraftFileMetadataService, DraftFileService
+from .base import LazyServiceMixin, ProfilingMixin
 
 
 class DraftFileResourceConfig(ResourceConfig):
@@ -24,15 +24,16 @@ class DraftFileResourceConfig(ResourceConfig):
     item_route = "/records/<pid_value>/draft/files/<key>"
 
 
-class DraftFileResource(CollectionResource):
+class DraftFileResource(ProfilingMixin, LazyServiceMixin, CollectionResource):
     """Draft file resource."""
 
     default_config = DraftFileResourceConfig
+    default_service = "draft_file_metadata"
 
     def __init__(self, service=None, *args, **kwargs):
         """Constructor."""
         super(DraftFileResource, self).__init__(*args, **kwargs)
-        self.service = service or DraftFileMetadataService()
+        self.service = service
 
     # List level
     def search(self, *args, **kwargs):
@@ -83,15 +84,17 @@ class DraftFileActionResourceConfig(ResourceConfig):
     list_route = "/records/<pid_value>/draft/files/<key>/<action>"
 
 
-class DraftFileActionResource(SingletonResource):
+class DraftFileActionResource(ProfilingMixin, LazyServiceMixin,
+                              SingletonResource):
     """Draft file action resource."""
 
-    default_config = DraftFileResourceConfig
+    default_config = DraftFileActionResourceConfig
+    default_service = "draft_file"
 
     def __init__(self, service=None, *args, **kwargs):
         """Constructor."""
-        super(DraftFileResource, self).__init__(*args, **kwargs)
-        self.service = service or DraftFileService()
+        super(DraftFileActionResource, self).__init__(*args, **kwargs)
+        self.service = service
 
     def read(self, *args, **kwargs):
         """Read an item."""
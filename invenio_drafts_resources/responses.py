@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Invenio Drafts Resources responses."""
+
+from flask import make_response
+from flask_resources.context import resource_requestctx
+from invenio_records_resources.responses import RecordResponse
+
+from .compression import compress_response
+
+
+class DraftResponse(RecordResponse):
+    """Draft response representation.
+
+    Unlike :class:`RecordResponse`, single objects are also given the URL
+    arguments, so that the serializer can apply the ``fields`` selection.
+    Bodies are compressed as negotiated with the client (see
+    :mod:`invenio_drafts_resources.compression`).
+    """
+
+    def make_item_response(self, content, code):
+        """Builds a response for a single object."""
+        return compress_response(make_response(
+            self.serializer.serialize_object(
+                content,
+                response_ctx={"url_args": resource_requestctx.request_args}
+            ),
+            code,
+            self.make_headers(),
+        ))
+
+    def make_list_response(self, content, code):
+        """Builds a response for a list of objects."""
+        return compress_response(
+            super(DraftResponse, self).make_list_response(content, code)
+        )
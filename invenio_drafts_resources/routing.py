@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Routing of the draft reads to a read replica of the database.
+
+When ``DRAFTS_RESOURCES_READ_REPLICA_URI`` is set, drafts are read from the
+replica. To let users read their own writes despite the replication lag,
+the revision of each draft a user writes is pinned for
+``DRAFTS_RESOURCES_READ_REPLICA_PIN_SECONDS``: while pinned, an older
+revision (or no draft at all) on the replica is read again from the
+primary database.
+
+The pins must be seen by all the processes serving the user, hence they
+are kept in Redis by default (see ``DRAFTS_RESOURCES_READ_REPLICA_PINS``).
+Anonymous users are pinned by client address.
+"""
+
+import time
+
+from flask import _app_ctx_stack, has_request_context, request
+from invenio_db import db
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm.exc import NoResultFound
+
+from .utils import LRUCache
+
+
+def _pin_seconds(app, seconds):
+    """Get the pin duration, by default from the configuration."""
+    if seconds is None:
+        seconds = app.config["DRAFTS_RESOURCES_READ_REPLICA_PIN_SECONDS"]
+    return seconds
+
+
+class PrimaryPins(object):
+    """Revisions of the drafts recently written by each user.
+
+    The pins are kept in the memory of the process, hence it is only suited
+    to a single process (e.g. development servers).
+    """
+
+    def __init__(self, app=None, seconds=None, maxsize=10000):
+        """Constructor.
+
+        :param seconds: How long a write is pinned (by default
+            ``DRAFTS_RESOURCES_READ_REPLICA_PIN_SECONDS``).
+        :param maxsize: Max. number of pins.
+        """
+        self.seconds = _pin_seconds(app, seconds)
+        self._pins = LRUCache(maxsize=maxsize)
+
+    def pin(self, user_id, draft_id, revision_id):
+        """Pin the revision of a draft written by a user."""
+        expires = time.monotonic() + self.seconds
+        self._pins.set((user_id, None), (None, expires))
+        self._pins.set((user_id, str(draft_id)), (revision_id, expires))
+
+    def _get(self, key):
+        """Get a pin, if not expired."""
+        revision_id, expires = self._pins.get(key, (None, 0))
+        if expires < time.monotonic():
+            return None, False
+        return revision_id, True
+
+    def revision(self, user_id, draft_id):
+        """Get the pinned revision of a draft for a user, if any."""
+        return self._get((user_id, str(draft_id)))[0]
+
+    def pinned(self, user_id):
+        """Check if a user recently wrote a draft."""
+        return self._get((user_id, None))[1]
+
+
+class RedisPins(object):
+    """Revisions of the drafts recently written by each user, in Redis.
+
+    It connects to ``DRAFTS_RESOURCES_READ_REPLICA_PINS_URL`` (by default
+    ``CACHE_REDIS_URL``). The pins of a user all expire together, the
+    given seconds after the last write of the user.
+    """
+
+    def __init__(self, app=None, seconds=None, url=None):
+        """Constructor (see :class:`PrimaryPins`)."""
+        from redis import StrictRedis
+
+        self.seconds = _pin_seconds(app, seconds)
+        url = url or app.config["DRAFTS_RESOURCES_READ_REPLICA_PINS_URL"] or \
+            app.config.get("CACHE_REDIS_URL", "redis://localhost:6379/0")
+        self.client = StrictRedis.from_url(url)
+
+    @staticmethod
+    def _key(user_id):
+        return "drafts-pins:{}".format(user_id)
+
+    def pin(self, user_id, draft_id, revision_id):
+        """Pin the revision of a draft written by a user."""
+        key = self._key(user_id)
+        pipe = self.client.pipeline()
+        pipe.hset(key, str(draft_id), revision_id)
+        pipe.pexpire(key, max(1, int(self.seconds * 1000)))
+        pipe.execute()
+
+    def revision(self, user_id, draft_id):
+        """Get the pinned revision of a draft for a user, if any."""
+        revision_id = self.client.hget(self._key(user_id), str(draft_id))
+        return int(revision_id) if revision_id is not None else None
+
+    def pinned(self, user_id):
+        """Check if a user recently wrote a draft."""
+        return bool(self.client.exists(self._key(user_id)))
+
+
+def _pin_user(identity):
+    """Get the pinned user of an identity (``None`` to not pin)."""
+    if identity.id is not None:
+        return identity.id
+    if has_request_context() and request.remote_addr:
+        return "addr:{}".format(request.remote_addr)
+    return None
+
+
+class ReadReplica(object):
+    """Sessions on a read replica of the database."""
+
+    def __init__(self, uri, pins, **engine_options):
+        """Constructor.
+
+        :param uri: Database URI of the replica.
+        :param pins: The pins of the users (e.g. :class:`RedisPins`).
+        """
+        engine_options.setdefault("pool_pre_ping", True)
+        self.engine = create_engine(uri, **engine_options)
+        self.session = scoped_session(
+            sessionmaker(bind=self.engine, autoflush=False),
+            scopefunc=_app_ctx_stack.__ident_func__,
+        )
+        self.pins = pins
+
+    def remove(self, exc=None):
+        """Close the session (``teardown_appcontext`` handler)."""
+        self.session.remove()
+
+    def pin(self, identity, draft):
+        """Pin the written revision of a draft for a user."""
+        user = _pin_user(identity)
+        if user is not None:
+            self.pins.pin(user, draft.id, draft.revision_id)
+
+    def read(self, identity, loader):
+        """Load a draft from the replica, or the primary if it is behind.
+
+        :param loader: Function taking a session and returning a tuple of
+            the record PID and the draft.
+        """
+        user = _pin_user(identity)
+        try:
+            pid, draft = loader(self.session)
+        except NoResultFound:
+            if user is None or not self.pins.pinned(user):
+                raise
+            # The draft might not be replicated yet.
+            return loader(db.session)
+
+        if user is None:
+            return pid, draft
+        revision_id = self.pins.revision(user, draft.id)
+        if revision_id is not None and draft.revision_id < revision_id:
+            return loader(db.session)
+        return pid, draft
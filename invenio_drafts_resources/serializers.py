@@ -9,12 +9,15 @@
 """Invenio Resources module to create REST APIs."""
 
 import json
+from copy import deepcopy
 
 import pytz
 from flask_resources.serializers import SerializerMixin
-from invenio_records_resources.links import link_for
+from invenio_records_resources.links import link_for, search_links
 from invenio_records_resources.serializers import RecordJSONSerializer
 
+from .profiling import timed
+
 
 class DraftJSONSerializer(RecordJSONSerializer):
     """Drafts JSON serializer implementation."""
@@ -23,34 +26,49 @@ class DraftJSONSerializer(RecordJSONSerializer):
         """Constructor."""
         self.schema = schema
 
-    def _process_draft(self, draft_unit, *args, **kwargs):
+    def _process_draft(self, draft_unit, fields=None, *args, **kwargs):
+        """Build the dict of a draft.
+
+        :param fields: Names of the fields to include (all if ``None``).
+            Dotted names (e.g. ``metadata.title``) select parts of the
+            metadata, without copying the rest of the document.
+        """
         pid = draft_unit.id
         draft = draft_unit.record  # FIXME: refactor to unit
-        draft_dict = dict(
-            pid=pid,
-            metadata=draft.dumps(),
-            revision=draft.revision_id,
-            status=draft.status,
-            created=(
-                pytz.utc.localize(draft.created).isoformat()
-                if draft.created and not draft.created.tzinfo
-                else None
-            ),
-            updated=(
-                pytz.utc.localize(draft.updated).isoformat()
-                if draft.updated and not draft.updated.tzinfo
-                else None
-            ),
-            expiry=(
-                pytz.utc.localize(draft.expiry_date).isoformat()
-                if draft.expiry_date and not draft.expiry_date.tzinfo
-                else None
-            ),
-            links=dict(
+        selection = _parse_fields(fields)
+
+        def _isoformat(date):
+            if date and not date.tzinfo:
+                return pytz.utc.localize(date).isoformat()
+            return None
+
+        def _metadata():
+            paths = selection.get("metadata") if selection else None
+            if paths is None:
+                return draft.dumps()
+            return _project(draft, paths)
+
+        builders = dict(
+            pid=lambda: pid,
+            metadata=_metadata,
+            revision=lambda: draft.revision_id,
+            status=lambda: draft.status,
+            created=lambda: _isoformat(draft.created),
+            updated=lambda: _isoformat(draft.updated),
+            expiry=lambda: _isoformat(draft.expiry_date),
+            links=lambda: dict(
                 self=link_for(api=True, tpl_key='draft', pid=pid),
                 self_html=link_for(api=False, tpl_key='draft', pid=pid),
-            )
+            ),
         )
+        draft_dict = {
+            name: build() for name, build in builders.items()
+            if selection is None or name in selection
+        }
+
+        if draft_unit.stale is not None and (
+                selection is None or "stale" in selection):
+            draft_dict["stale"] = draft_unit.stale
 
         # TODO: Shall we includ fork_version_id and record_pid in
         # the serialization?
@@ -59,15 +77,70 @@ class DraftJSONSerializer(RecordJSONSerializer):
     def serialize_object(self, obj, response_ctx=None, *args, **kwargs):
         """Dump the object into a json string."""
         if obj:  # e.g. delete op has no return body
-            return json.dumps(self._process_draft(obj))
+            url_args = response_ctx.get("url_args") if response_ctx else {}
+            with timed("serialization"):
+                return json.dumps(self._process_draft(
+                    obj, fields=(url_args or {}).get("fields")
+                ))
         else:
             return ""
 
     def serialize_object_list(
         self, obj_list, response_ctx=None, *args, **kwargs
     ):
-        """Not implemented.
+        """Dump the object list into a json string.
 
-        Drafts are only serialized and returned back as individual objects.
+        :param: obj_list a RecordSearchState object
         """
-        raise NotImplementedError()
+        url_args = dict(response_ctx.get("url_args") or {}) \
+            if response_ctx else {}
+        fields = url_args.pop("fields", None)
+
+        with timed("serialization"):
+            return json.dumps({
+                "hits": {
+                    "hits": [
+                        self._process_draft(draft_unit, fields=fields)
+                        for draft_unit in obj_list.records
+                    ],
+                    "total": obj_list.total
+                },
+                "links": search_links(url_args=url_args, total=obj_list.total),
+                "aggregations": obj_list.aggregations
+            })
+
+
+def _parse_fields(fields):
+    """Group the selected fields by top-level name.
+
+    :returns: ``None`` to select everything, else a dict of the top-level
+        names to the list of their selected sub-paths (``None`` for all).
+    """
+    if not fields:
+        return None
+    selection = {}
+    for field in fields:
+        name, _, path = field.strip().partition(".")
+        if not path:
+            selection[name] = None
+        elif selection.get(name, []) is not None:
+            selection.setdefault(name, []).append(path)
+    return selection
+
+
+def _project(document, paths):
+    """Copy the dotted paths of a document, skipping the missing ones."""
+    result = {}
+    for path in paths:
+        keys = path.split(".")
+        value = document
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = result
+            for key in keys[:-1]:
+                target = target.setdefault(key, {})
+            target[keys[-1]] = deepcopy(value)
+    return result
@@ -10,12 +10,14 @@
 """Draft Services."""
 
 from .draft import RecordDraftService, RecordDraftServiceConfig
+from .draft_async import AsyncRecordDraftService
 from .draft_file import DraftFileService, DraftFileServiceConfig
 from .draft_file_metadata import DraftFileMetadataService, \
     DraftFileMetadataServiceConfig
 from .draft_version import DraftVersionService, DraftVersionServiceConfig
 
 __all__ = (
+    "AsyncRecordDraftService",
     "DraftFileMetadataService",
     "DraftFileMetadataServiceConfig",
     "DraftFileService",
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Draft data validators."""
+
+from threading import Lock
+
+from invenio_records_resources.services import MarshmallowDataValidator
+
+
+class ReusableDataValidator(MarshmallowDataValidator):
+    """Data validator reusing a single schema instance.
+
+    The schema is instantiated on first use and shared by all the threads of
+    the process, since loading does not modify it. Validations given a
+    context still get their own schema instance.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(ReusableDataValidator, self).__init__(*args, **kwargs)
+        self._schema = None
+        self._lock = Lock()
+
+    def validate(self, data, context=None):
+        """Validate by loading the data with the schema."""
+        if context is not None:
+            return super(ReusableDataValidator, self).validate(data, context)
+        if self._schema is None:
+            with self._lock:
+                if self._schema is None:
+                    self._schema = self.schema()
+        return self._schema.load(data)
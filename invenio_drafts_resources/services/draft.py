@@ -10,30 +10,99 @@
 
 """Draft Service."""
 
+import copy
+import uuid
+from datetime import datetime, timedelta
+from threading import Lock
+
+import jsonpatch
+from elasticsearch_dsl.query import Q
+from flask import current_app
 from invenio_db import db
-from invenio_records_resources.services import MarshmallowDataValidator, \
-    RecordService, RecordServiceConfig
+from invenio_pidstore.errors import PIDDoesNotExistError
+from invenio_records_resources.links import link_for
+from invenio_records_resources.services import RecordService, \
+    RecordServiceConfig
+from invenio_records_resources.services.errors import PermissionDeniedError
+from invenio_rest.errors import FieldError, RESTValidationError
+from sqlalchemy.orm.exc import NoResultFound, StaleDataError
 
+from ..drafts.counters import get_counters, reconcile_counters
+from ..drafts.merge import MergeConflict, three_way_merge
+from ..drafts.ndjson import export_drafts, import_drafts
+from ..feed import feed_channel
+from ..profiling import timed
 from ..resource_units import IdentifiedRecordDraft
+from ..tasks import publish_draft
+from ..utils import LRUCache
+from .data_validator import ReusableDataValidator
+from .errors import DraftConflictRESTError
 from .permissions import DraftPermissionPolicy
 from .schemas import DraftMetadataSchemaJSONV1
 
 
+def _check_edits(edits):
+    """Check the shape of a batch of autosave edits.
+
+    :raises RESTValidationError: If the batch is not a list of edit objects
+        with supported operations, and numeric timestamps on either all or
+        none of them.
+    """
+    if not isinstance(edits, list):
+        raise RESTValidationError(errors=[
+            FieldError("/", "Edits must be a list.")
+        ])
+    for index, edit in enumerate(edits):
+        if not isinstance(edit, dict):
+            raise RESTValidationError(errors=[FieldError(
+                "/{}".format(index), "Edits must be objects."
+            )])
+        path = edit.get("path", "/")
+        if edit.get("op") not in ("add", "remove", "replace"):
+            raise RESTValidationError(errors=[
+                FieldError(path, "Unsupported edit operation.")
+            ])
+        timestamp = edit.get("timestamp")
+        if timestamp is not None and (
+                isinstance(timestamp, bool) or
+                not isinstance(timestamp, (int, float))):
+            raise RESTValidationError(errors=[
+                FieldError(path, "Edit timestamps must be numbers.")
+            ])
+    # Untimed edits cannot be ordered among timed ones.
+    if len({edit.get("timestamp") is None for edit in edits}) > 1:
+        raise RESTValidationError(errors=[FieldError(
+            "/", "Either all or none of the edits must have a timestamp."
+        )])
+    return edits
+
+
 class RecordDraftServiceConfig(RecordServiceConfig):
     """Draft Service configuration."""
 
     # Service configuration
     permission_policy_cls = DraftPermissionPolicy
+    # Max. number of (identity, action) permission results kept in memory.
+    # Set to 0 to disable the cache.
+    permission_cache_size = 1024
+    # Max. number of draft/record diffs kept in memory.
+    diff_cache_size = 256
 
     # RecordService configuration
     resource_unit_cls = IdentifiedRecordDraft
-    data_validator = MarshmallowDataValidator(
-        schema=DraftMetadataSchemaJSONV1
-    )
+    data_validator = ReusableDataValidator(schema=DraftMetadataSchemaJSONV1)
 
     # DraftService configuration.
     # WHY: We want to force user input choice here.
     draft_cls = None
+    # Max. number of merges retried when a concurrent update is detected
+    # while saving a draft.
+    max_merge_retries = 3
+    # Drafts expiring within this many days are counted as expiring soon.
+    expiring_soon_days = 7
+    # Name of the service in ``DRAFTS_RESOURCES_SERVICES``, for the
+    # background publish task to get it.
+    service_name = "draft"
 
 
 class RecordDraftService(RecordService):
@@ -41,13 +110,175 @@ class RecordDraftService(RecordService):
 
     default_config = RecordDraftServiceConfig
 
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(RecordDraftService, self).__init__(*args, **kwargs)
+        self._permission_cache = LRUCache(
+            maxsize=self.config.permission_cache_size
+        )
+        self._diff_cache = LRUCache(maxsize=self.config.diff_cache_size)
+        self._indexer = None
+        self._lock = Lock()
+
+    def indexer(self):
+        """Get the indexer, created once and shared across requests.
+
+        The indexer goes through the application's search client, hence it
+        reuses its pool of keep-alive connections.
+        """
+        if self._indexer is None and self.config.indexer_cls:
+            with self._lock:
+                if self._indexer is None:
+                    self._indexer = self.config.indexer_cls()
+        return self._indexer
+
+    #
+    # Permissions checking
+    #
+    @staticmethod
+    def _identity_key(identity):
+        """Cache key of an identity: who it is and what it provides."""
+        return (identity.id, frozenset(identity.provides))
+
+    def require_permission(self, identity, action_name, **kwargs):
+        """Require a permission, caching record-independent results.
+
+        Checks over an object (e.g. ``record=...``) depend on the object and
+        are always evaluated. Checks that only depend on the identity are
+        cached per identity and action.
+        """
+        if kwargs or not self.config.permission_cache_size:
+            return super(RecordDraftService, self).require_permission(
+                identity, action_name, **kwargs
+            )
+
+        key = (self._identity_key(identity), action_name)
+        if self._permission_cache.get(key):
+            return
+        # Raises if the identity is not allowed, denials are not cached so
+        # that granting a permission takes effect straight away.
+        super(RecordDraftService, self).require_permission(
+            identity, action_name
+        )
+        self._permission_cache.set(key, True)
+
+    def invalidate_permissions(self, identity=None, action_name=None):
+        """Invalidate cached permission results.
+
+        :param identity: Only invalidate the results of this identity.
+        :param action_name: Only invalidate the results of this action.
+        """
+        identity_key = self._identity_key(identity) if identity else None
+
+        def _match(key):
+            return (
+                (identity_key is None or key[0] == identity_key) and
+                (action_name is None or key[1] == action_name)
+            )
+
+        self._permission_cache.discard(_match)
+
+    def require_permission_many(self, identity, action_name, records):
+        """Require a permission over each one of the given records.
+
+        The policy generators are evaluated for every record, but records
+        producing the same needs and excludes (e.g. same owners) share a
+        single evaluation against the identity.
+        """
+        results = {}
+        for record in records:
+            policy = self.permission_policy(action_name, record=record)
+            key = (frozenset(policy.needs), frozenset(policy.excludes))
+            if key not in results:
+                results[key] = policy.allows(identity)
+            if not results[key]:
+                # Let the base implementation raise the error.
+                super(RecordDraftService, self).require_permission(
+                    identity, action_name, record=record
+                )
+
+    def permission_filter(self, identity, action_name="read"):
+        """Translate the permission policy into a search filter.
+
+        :returns: An ``elasticsearch_dsl`` query matching the drafts the
+            identity is allowed to perform the action on.
+        """
+        policy = self.permission_policy(action_name, identity=identity)
+        filters = policy.query_filters
+        if not filters:
+            return ~Q("match_all")
+        return Q("bool", should=filters, minimum_should_match=1)
+
+    #
+    # Draft resolution
+    #
+    def resolve_draft(self, id_, session=None):
+        """Resolve a record PID value to its draft.
+
+        Drafts of new records have no PID yet, they are resolved by their
+        draft id instead.
+
+        :param session: Session to load the draft with (e.g. of a read
+            replica). PIDs are always resolved with the primary one.
+        :returns: A tuple with the record PID (or `None`) and the draft.
+        """
+        # Only the record id is needed, not the record itself.
+        resolver = self.config.resolver_cls(
+            pid_type=self.config.pid_type, getter=lambda record_id: record_id
+        )
+        try:
+            pid, record_id = resolver.resolve(id_)
+        except PIDDoesNotExistError as error:
+            try:
+                draft_id = uuid.UUID(str(id_))
+            except ValueError:
+                raise error
+            return None, self.config.draft_cls.get_record(
+                draft_id, session=session
+            )
+        return pid, self.config.draft_cls.get_by_fork(
+            record_id, session=session
+        )
+
+    def _read_replica(self):
+        """Get the read replica, if configured."""
+        ext = current_app.extensions.get("invenio-drafts-resources")
+        return getattr(ext, "read_replica", None)
+
+    def _notify(self, draft, message):
+        """Send a message on the changes feed of a draft.
+
+        :param message: Function returning the message, only called when
+            someone listens.
+        """
+        ext = current_app.extensions.get("invenio-drafts-resources")
+        if ext is None:
+            return
+        channel = feed_channel(draft)
+        if ext.feed.has_subscribers(channel):
+            ext.feed.publish(channel, message())
+
+    def _publish_change(self, draft, previous=None):
+        """Publish a saved draft revision on the changes feed."""
+        self._notify(draft, lambda: {
+            "revision_id": draft.revision_id,
+            "patch": jsonpatch.make_patch(previous or {}, dict(draft)).patch,
+        })
+
+    def _pin(self, identity, draft):
+        """Pin a written draft revision to the primary for the identity."""
+        replica = self._read_replica()
+        if replica is not None:
+            replica.pin(identity, draft)
+
     # High-level API
     # Inherits record read, search, create, delete and update
 
     def _index_draft(self, draft):
         indexer = self.indexer()
         if indexer:
-            indexer.index(draft)
+            with timed("indexing"):
+                indexer.index(draft)
 
     def create(self, data, identity):
         """Create a draft for a new record.
@@ -55,12 +286,19 @@ class RecordDraftService(RecordService):
         It does not eagerly create the associated record.
         """
         self.require_permission(identity, "create")
-        validated_data = self.data_validator().validate(data)
-        draft = self.config.draft_cls.create(validated_data)
-        db.session.commit()  # Persist DB
+        with timed("validation"):
+            validated_data = self.data_validator().validate(data)
+        with timed("db-flush"):
+            draft = self.config.draft_cls.create(validated_data)
+        with timed("db-commit"):
+            db.session.commit()  # Persist DB
         self._index_draft(draft)
+        self._pin(identity, draft)
 
-        return self.config.resource_unit_cls(pid=None, record=draft)
+        # Drafts of new records have no record to be stale against.
+        return self.config.resource_unit_cls(
+            pid=None, record=draft, stale=False
+        )
 
     def edit(self, id_, data, identity):
         """Create a draft for an existing record.
@@ -70,14 +308,395 @@ class RecordDraftService(RecordService):
         pid, record = self.resolve(id_)
         # FIXME: How to check permission on the record?
         self.require_permission(identity, "create")
-        validated_data = self.data_validator().validate(data)
-        draft = self.config.draft_cls.create(validated_data, record)
-        db.session.commit()  # Persist DB
+        with timed("validation"):
+            validated_data = self.data_validator().validate(data)
+        with timed("db-flush"):
+            draft = self.config.draft_cls.create(validated_data, record)
+        with timed("db-commit"):
+            db.session.commit()  # Persist DB
         self._index_draft(draft)
+        self._pin(identity, draft)
+        self._publish_change(draft)
+
+        # Just forked from the current record revision.
+        return self.config.resource_unit_cls(
+            pid=pid, record=draft, stale=False
+        )
+
+    def read_draft(self, id_, identity):
+        """Read the draft of a record (or a draft by its id).
+
+        It is read from the read replica if configured, unless the identity
+        recently wrote a newer revision of it.
+        """
+        replica = self._read_replica()
+        if replica is None:
+            pid, draft = self.resolve_draft(id_)
+        else:
+            pid, draft = replica.read(
+                identity,
+                lambda session: self.resolve_draft(id_, session=session)
+            )
+        self.require_permission(identity, "read", record=draft)
+
+        return self.config.resource_unit_cls(
+            pid=pid, record=draft, stale=self.is_stale(draft)
+        )
+
+    def _merge(self, draft, base_revision_id, data):
+        """Merge changes made over a draft revision into its current one."""
+        try:
+            base = draft.get_revision(base_revision_id)
+        except IndexError:
+            raise DraftConflictRESTError(paths=["/"])
+        try:
+            return three_way_merge(base, data, dict(draft))
+        except MergeConflict as conflict:
+            raise DraftConflictRESTError(paths=conflict.paths)
+
+    def update(self, id_, data, identity, revision_id=None):
+        """Replace the content of a draft.
+
+        Concurrent updates do not need to be retried by the client: when the
+        draft has moved past the revision the client edited (``revision_id``)
+        or is modified while saving, the changes are merged with the
+        concurrent ones. Only changes to the same values are rejected.
+
+        :param id_: record PID value (draft id for new records).
+        :param revision_id: revision of the draft the changes are based on.
+        :raises DraftConflictRESTError: On conflicting changes.
+        """
+        pid, draft = self.resolve_draft(id_)
+        self.require_permission(identity, "update", record=draft)
+        with timed("validation"):
+            data = self.data_validator().validate(data)
+        if revision_id is None:
+            revision_id = draft.revision_id
+
+        return self._save(id_, identity, pid, draft, data, revision_id)
+
+    def _save(self, id_, identity, pid, draft, data, revision_id):
+        """Save validated changes over a revision, merging if needed."""
+        for attempt in range(self.config.max_merge_retries + 1):
+            if revision_id != draft.revision_id:
+                data = self._merge(draft, revision_id, data)
+                revision_id = draft.revision_id
+            previous = dict(draft)
+            draft.clear()
+            draft.update(data)
+            try:
+                with timed("db-flush"):
+                    draft.commit()
+                with timed("db-commit"):
+                    db.session.commit()
+                break
+            except StaleDataError:
+                db.session.rollback()
+                pid, draft = self.resolve_draft(id_)
+        else:
+            raise DraftConflictRESTError(paths=["/"])
+
+        self._index_draft(draft)
+        self._pin(identity, draft)
+        self._publish_change(draft, previous)
+
+        return self.config.resource_unit_cls(
+            pid=pid, record=draft, stale=self.is_stale(draft)
+        )
+
+    def autosave(self, id_, edits, identity, revision_id=None):
+        """Apply a batch of field edits to a draft, as a single revision.
+
+        The edits are applied in the order of their client timestamps, then
+        saved like an update: validated, committed and indexed once.
 
-        return self.config.resource_unit_cls(pid=pid, record=draft)
+        :param id_: record PID value (draft id for new records).
+        :param edits: JSON patch ``add``, ``remove`` or ``replace``
+            operations, with a ``timestamp`` (number) on all or none of
+            them. Untimed edits are applied in the given order.
+        :param revision_id: revision of the draft the edits were made on.
+        :raises RESTValidationError: If an edit cannot be applied.
+        :raises DraftConflictRESTError: On conflicting changes.
+        """
+        pid, draft = self.resolve_draft(id_)
+        self.require_permission(identity, "update", record=draft)
+        if revision_id is None:
+            revision_id = draft.revision_id
+
+        if revision_id == draft.revision_id:
+            data = dict(draft)
+        else:
+            try:
+                data = draft.get_revision(revision_id)
+            except IndexError:
+                raise DraftConflictRESTError(paths=["/"])
+
+        operations = []
+        # Stable: edits with the same (or no) timestamp keep their order.
+        for edit in sorted(_check_edits(edits),
+                           key=lambda e: e.get("timestamp") or 0):
+            operations.append(
+                {k: v for k, v in edit.items() if k != "timestamp"}
+            )
+        # Edited in place, on a single copy of the document.
+        data = copy.deepcopy(data)
+        for operation in operations:
+            try:
+                data = jsonpatch.apply_patch(data, [operation], in_place=True)
+            except (jsonpatch.JsonPatchException,
+                    jsonpatch.JsonPointerException) as error:
+                raise RESTValidationError(errors=[
+                    FieldError(operation.get("path", "/"), str(error))
+                ])
+
+        with timed("validation"):
+            data = self.data_validator().validate(data)
+        return self._save(id_, identity, pid, draft, data, revision_id)
+
+    def is_stale(self, draft):
+        """Check if the record of a draft changed since it was forked."""
+        return draft.is_stale(self.record_cls().model_cls)
+
+    def stale_drafts(self, identity):
+        """Report the drafts whose record changed since they were forked.
+
+        :returns: An iterator of dicts with the ``draft_id``, ``fork_id``,
+            ``fork_revision_id`` and current ``record_revision_id``.
+        """
+        # Checked on call, not on the first iteration.
+        self.require_permission(identity, "report")
+        query = self.config.draft_cls.stale_query(
+            self.record_cls().model_cls
+        )
+        return (
+            dict(
+                draft_id=draft_id,
+                fork_id=fork_id,
+                fork_revision_id=fork_version_id,
+                record_revision_id=record_revision_id,
+            )
+            for draft_id, fork_id, fork_version_id, record_revision_id
+            in query
+        )
+
+    def owner_counters(self, identity):
+        """Get the draft counters of the identity's user.
+
+        The counters are precomputed (see
+        :mod:`invenio_drafts_resources.drafts.counters`), the stale count
+        being only refreshed on reconciliation.
+
+        :returns: A dict with the number of drafts by ``status``, the ones
+            ``expiring_soon`` and the ``stale`` ones.
+        """
+        model_cls = self.config.draft_cls.counters_model_cls
+        if identity.id is None or model_cls is None:
+            raise PermissionDeniedError("counters")
+
+        today = datetime.utcnow().date()
+        horizon = today + timedelta(days=self.config.expiring_soon_days)
+        result = dict(status={}, expiring_soon=0, stale=0)
+        for counter, count in get_counters(model_cls, identity.id).items():
+            # Drifted (negative) counters show as zero until reconciled.
+            count = max(count, 0)
+            kind, _, value = counter.partition(":")
+            if kind == "status":
+                result["status"][value] = count
+            elif kind == "expires":
+                expires = datetime.strptime(value, "%Y-%m-%d").date()
+                if today <= expires <= horizon:
+                    result["expiring_soon"] += count
+            elif kind == "stale":
+                result["stale"] = count
+        return result
+
+    def diff(self, id_, identity):
+        """Get the changes of a draft over the record revision it forked.
+
+        Drafts of new records are compared against an empty document.
+
+        :returns: A dict with the draft and record revisions and the list of
+            changes, as JSON Patch operations.
+        """
+        pid, draft = self.resolve_draft(id_)
+        self.require_permission(identity, "read", record=draft)
+
+        key = (draft.id, draft.revision_id, draft.fork_version_id)
+        changes = self._diff_cache.get(key)
+        if changes is None:
+            base = {}
+            if draft.fork_id:
+                record = self.record_cls().get_record(draft.fork_id)
+                base = record.revisions[draft.fork_version_id]
+            changes = jsonpatch.make_patch(dict(base), dict(draft)).patch
+            self._diff_cache.set(key, changes)
+
+        # Callers get their own copy of the cached changes.
+        return dict(
+            draft_revision=draft.revision_id,
+            record_revision=draft.fork_version_id,
+            changes=copy.deepcopy(changes),
+        )
+
+    def list_revisions(self, id_, identity, page=1, size=10):
+        """List the revisions of a draft, latest first.
+
+        :returns: A dict with the ``total`` number of revisions and the
+            ``hits`` of the page: their ``revision_id``, ``created`` date and
+            whether they are a snapshot. Documents are read with
+            :meth:`read_revision`.
+        """
+        pid, draft = self.resolve_draft(id_)
+        self.require_permission(identity, "read", record=draft)
+
+        total, revisions = draft.list_revisions(page=page, size=size)
+        return dict(total=total, hits=[
+            dict(
+                revision_id=revision.revision_id,
+                created=revision.created,
+                is_snapshot=revision.is_snapshot,
+            )
+            for revision in revisions
+        ])
+
+    def read_revision(self, id_, revision_id, identity):
+        """Get the document of a revision of a draft.
+
+        :raises PIDDoesNotExistError: If the revision does not exist.
+        """
+        pid, draft = self.resolve_draft(id_)
+        self.require_permission(identity, "read", record=draft)
+        try:
+            return draft.get_revision(revision_id)
+        except IndexError:
+            raise PIDDoesNotExistError("revision", revision_id)
+
+    def export(self, identity, chunk_size=1000):
+        """Stream all the drafts as NDJSON lines.
+
+        See :func:`invenio_drafts_resources.drafts.ndjson.export_drafts`.
+        """
+        self.require_permission(identity, "export")
+        return export_drafts(self.config.draft_cls.model_cls, chunk_size)
+
+    def import_(self, lines, identity, batch_size=1000):
+        """Import drafts from NDJSON lines, keeping their ids.
+
+        The drafts are not indexed, reindex them afterwards. The per-owner
+        counters are reconciled.
+
+        :returns: The number of imported drafts.
+        """
+        self.require_permission(identity, "import")
+        draft_cls = self.config.draft_cls
+        count = import_drafts(draft_cls.model_cls, lines, batch_size)
+        if draft_cls.counters_model_cls is not None:
+            reconcile_counters(draft_cls, self.record_cls().model_cls)
+        return count
+
+    def publish(self, id_, identity, progress=None):
+        """Publish a draft into its record.
+
+        :param progress: Called with the number of done and total steps.
+        """
+        pid, draft = self.resolve_draft(id_)
+        self.require_permission(identity, "publish", record=draft)
+        return self._publish(pid, draft, progress=progress)
+
+    def _publish(self, pid, draft, progress=None, reindex_only=False):
+        """Publish a resolved draft, without checking the permissions.
+
+        :param reindex_only: Only reindex the record of a published draft,
+            to retry a publish interrupted by a search cluster failure.
+        """
+        record_cls = self.record_cls()
+        if reindex_only and draft.status == "published":
+            record = record_cls.get_record(draft.fork_id)
+        else:
+            with timed("db-flush"):
+                if draft.fork_id:
+                    record = record_cls.get_record(draft.fork_id)
+                    record.clear()
+                    record.update(dict(draft))
+                    record.commit()
+                else:
+                    record = record_cls.create(dict(draft))
+                    pid = self.minter()(record_uuid=record.id, data=record)
+                draft.model.status = "published"
+                draft.model.fork_id = record.id
+                draft.model.fork_version_id = record.revision_id
+                draft.commit()
+            with timed("db-commit"):
+                db.session.commit()
+        if progress:
+            progress(1, 2)
+
+        indexer = self.indexer()
+        if indexer:
+            with timed("indexing"):
+                indexer.index(record)
+                indexer.index(draft)
+        if progress:
+            progress(2, 2)
+
+        if pid is None:
+            pid = self.fetcher()(record_uuid=record.id, data=record)
+        self._notify(draft, lambda: {
+            "event": "publish",
+            "revision_id": draft.revision_id,
+            "pid": pid.pid_value,
+        })
+        return self.config.resource_unit_cls(pid=pid, record=record)
+
+    def publish_in_background(self, id_, identity):
+        """Send a task publishing a draft.
+
+        :returns: A dict with the ``id`` of the publish job and its
+            ``links``.
+        """
+        pid, draft = self.resolve_draft(id_)
+        self.require_permission(identity, "publish", record=draft)
+        # The job id tells which draft it publishes, to check the
+        # permissions when polling it.
+        job_id = "{}.{}".format(draft.id, uuid.uuid4())
+        publish_draft.apply_async(
+            args=(str(draft.id), self.config.service_name),
+            task_id=job_id,
+            queue=current_app.config["DRAFTS_RESOURCES_PUBLISH_QUEUE"],
+        )
+        return dict(
+            id=job_id,
+            links=dict(
+                self=link_for(api=True, tpl_key="publish_job", job_id=job_id),
+            ),
+        )
+
+    def publish_status(self, job_id, identity):
+        """Get the state of a background publish.
+
+        The identity must be allowed to read the published draft.
+
+        :raises PIDDoesNotExistError: If the job id is invalid or its draft
+            no longer exists.
+
+        :returns: A dict with the ``state`` of the job and, depending on it,
+            its ``progress`` (done and total steps), the published ``pid``
+            or the ``error``.
+        """
+        draft_id, _, _ = job_id.partition(".")
+        try:
+            draft = self.config.draft_cls.get_record(uuid.UUID(draft_id))
+        except (ValueError, NoResultFound):
+            # Invalid job id, or its draft was deleted or archived since.
+            raise PIDDoesNotExistError("job", job_id)
+        self.require_permission(identity, "read", record=draft)
 
-    def publish(self, id_, identity):
-        """Publish a draft."""
-        # TODO: IMPLEMENT ME!
-        return self.config.draft_of_resource_unit_cls()
+        result = publish_draft.AsyncResult(job_id)
+        status = dict(id=job_id, state=result.state)
+        if result.state == "PROGRESS":
+            status["progress"] = result.info
+        elif result.successful():
+            status["pid"] = result.result
+        elif result.failed():
+            status["error"] = str(result.result)
+        return status
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Asyncio interface of the draft service."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from flask import current_app
+from invenio_db import db
+
+
+class AsyncRecordDraftService(object):
+    """Asyncio interface of a draft service.
+
+    The calls are delegated to the (synchronous) draft service, so that
+    validation, permissions and indexing behave the same, and run on a
+    bounded pool of threads each with its own application context and
+    database session. The pool should not be larger than the database
+    connection pool.
+    """
+
+    def __init__(self, service, app=None, max_workers=10):
+        """Constructor.
+
+        :param service: The draft service.
+        :param app: The application to run the calls in (by default the
+            current application when calling).
+        :param max_workers: Max. number of calls running concurrently.
+        """
+        self.service = service
+        self.app = app
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def _run(self, app, method, *args, **kwargs):
+        """Run a service method in an application context."""
+        with app.app_context():
+            try:
+                return method(*args, **kwargs)
+            finally:
+                # Give the connection back to the pool.
+                db.session.remove()
+
+    def _call(self, method, *args, **kwargs):
+        """Schedule a service method call on the thread pool."""
+        app = self.app or current_app._get_current_object()
+        loop = asyncio.get_event_loop()
+        return loop.run_in_executor(
+            self._executor,
+            partial(self._run, app, method, *args, **kwargs)
+        )
+
+    async def create(self, data, identity):
+        """Create a draft for a new record."""
+        return await self._call(self.service.create, data, identity)
+
+    async def edit(self, id_, data, identity):
+        """Create a draft for an existing record."""
+        return await self._call(self.service.edit, id_, data, identity)
+
+    async def update(self, id_, data, identity, revision_id=None):
+        """Update a draft."""
+        return await self._call(
+            self.service.update, id_, data, identity, revision_id=revision_id
+        )
+
+    async def read(self, id_, identity):
+        """Read a record."""
+        return await self._call(self.service.read, id_, identity)
+
+    async def read_draft(self, id_, identity):
+        """Read the draft of a record."""
+        return await self._call(self.service.read_draft, id_, identity)
+
+    async def search(self, querystring, identity, pagination=None, **kwargs):
+        """Search for records matching the querystring."""
+        return await self._call(
+            self.service.search, querystring, identity,
+            pagination=pagination, **kwargs
+        )
+
+    async def publish(self, id_, identity):
+        """Publish a draft."""
+        return await self._call(self.service.publish, id_, identity)
+
+    def shutdown(self, wait=True):
+        """Stop the thread pool."""
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Draft service errors."""
+
+from invenio_rest.errors import FieldError, RESTException
+
+
+class DraftConflictRESTError(RESTException):
+    """The draft was concurrently modified with conflicting changes."""
+
+    code = 409
+    description = "The draft was modified with conflicting changes."
+
+    def __init__(self, paths, **kwargs):
+        """Constructor.
+
+        :param paths: JSON pointers of the conflicting values.
+        """
+        super(DraftConflictRESTError, self).__init__(
+            errors=[FieldError(p, "Conflicting change.") for p in paths],
+            **kwargs
+        )
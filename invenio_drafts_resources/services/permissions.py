@@ -9,7 +9,7 @@
 
 """Drafts permissions."""
 
-from invenio_records_permissions.generators import AnyUser
+from invenio_records_permissions.generators import AnyUser, SuperUser
 from invenio_records_permissions.policies.records import RecordPermissionPolicy
 
 
@@ -19,3 +19,10 @@ class DraftPermissionPolicy(RecordPermissionPolicy):
     # FIXME: Revist this along the development
     # Default create should be "authenticated"?
     can_create = [AnyUser()]
+    can_publish = [AnyUser()]
+
+    # Bulk export/import of all the drafts
+    can_export = [SuperUser()]
+    can_import = [SuperUser()]
+    # Reports over all the drafts
+    can_report = [SuperUser()]
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Background tasks of the drafts.
+
+Publishes are bounded by the concurrency of the Celery workers consuming
+them. Route them to a dedicated queue (``DRAFTS_RESOURCES_PUBLISH_QUEUE``)
+to run them on their own pool of workers, e.g.
+``celery worker -Q drafts-publish --concurrency 4``.
+
+The drafts in a terminal state are archived periodically by scheduling
+:func:`archive_drafts` with Celery beat:
+
+.. code-block:: python
+
+    CELERY_BEAT_SCHEDULE = {
+        "drafts-archive": {
+            "task": "invenio_drafts_resources.tasks.archive_drafts",
+            "schedule": timedelta(hours=1),
+            "kwargs": {"expired_days": 30},
+        },
+    }
+"""
+
+from datetime import datetime, timedelta
+
+from celery import shared_task
+from elasticsearch.exceptions import ConnectionError
+
+from .proxies import current_drafts_resources
+
+
+@shared_task(bind=True, ignore_result=False, acks_late=True,
+             autoretry_for=(ConnectionError,), retry_backoff=True,
+             max_retries=5)
+def publish_draft(self, id_, service="draft"):
+    """Publish a draft, reporting the progress in the task state.
+
+    The permissions are checked when the task is sent. Retries after a
+    search cluster failure only reindex the already published record.
+
+    :param id_: Draft id.
+    :param service: Name of the draft service (see
+        ``DRAFTS_RESOURCES_SERVICES``).
+    :returns: The PID value of the record.
+    """
+    def progress(done, total):
+        self.update_state(state="PROGRESS", meta=dict(done=done, total=total))
+
+    draft_service = current_drafts_resources.service(service)
+    pid, draft = draft_service.resolve_draft(id_)
+    return draft_service._publish(
+        pid, draft, progress=progress, reindex_only=self.request.retries > 0
+    ).id
+
+
+@shared_task(ignore_result=True)
+def archive_drafts(service="draft", expired_days=None, batch_size=1000):
+    """Move the drafts in a terminal state to the archive.
+
+    Drafts whose draft class has no archive model are left as they are.
+
+    :param service: Name of the draft service (see
+        ``DRAFTS_RESOURCES_SERVICES``).
+    :param expired_days: Also archive the drafts expired since this many
+        days.
+    :returns: The number of archived drafts.
+    """
+    draft_service = current_drafts_resources.service(service)
+    draft_cls = draft_service.config.draft_cls
+    if draft_cls.archive_model_cls is None:
+        return 0
+    expired_before = None
+    if expired_days is not None:
+        expired_before = datetime.utcnow() - timedelta(days=expired_days)
+    return draft_cls.archive(
+        expired_before=expired_before, batch_size=batch_size,
+        indexer=draft_service.indexer(),
+    )
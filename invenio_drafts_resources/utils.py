@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Utility functions."""
+
+from collections import OrderedDict
+from threading import RLock
+
+
+class LRUCache(object):
+    """Small thread-safe least-recently-used cache.
+
+    Services are shared between requests (and threads), hence the lock.
+    """
+
+    def __init__(self, maxsize=1024):
+        """Constructor."""
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, key, default=None):
+        """Get a value and mark it as recently used."""
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key, value):
+        """Set a value, evicting the least recently used one if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, predicate):
+        """Remove all the entries whose key matches the predicate."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        """Check if a key is cached."""
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        """Number of cached entries."""
+        with self._lock:
+            return len(self._data)
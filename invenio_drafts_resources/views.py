@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Operational views of the drafts module."""
+
+from flask import Blueprint, Response, abort, current_app, g, jsonify
+from invenio_db import db
+from invenio_pidstore.errors import PIDDoesNotExistError
+from invenio_records_resources.services.errors import PermissionDeniedError
+from invenio_search import current_search_client
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import NoResultFound
+
+from .feed import event_stream, feed_channel
+from .proxies import current_drafts_resources
+
+
+def _can_report():
+    """Check if the current identity may see the operational details."""
+    service = current_drafts_resources.service("draft")
+    try:
+        service.require_permission(g.identity, "report")
+    except PermissionDeniedError:
+        return False
+    return True
+
+
+def metrics():
+    """Prometheus metrics of the drafts requests."""
+    if not current_app.config["DRAFTS_RESOURCES_PROFILING_ENABLED"]:
+        abort(404)
+    if not _can_report():
+        abort(403)
+    ext = current_app.extensions["invenio-drafts-resources"]
+    return ext.metrics.render(), 200, {
+        "Content-Type": "text/plain; version=0.0.4"
+    }
+
+
+def _search_pool_status():
+    """Connections of the search client pool."""
+    pool = current_search_client.transport.connection_pool
+    connections = []
+    for connection in pool.connections:
+        http_pool = getattr(connection, "pool", None)
+        connections.append({
+            "host": connection.host,
+            "pooled": getattr(http_pool, "num_connections", None),
+            "requests": getattr(http_pool, "num_requests", None),
+        })
+    return {
+        "connections": connections,
+        "dead": len(getattr(pool, "dead_count", {})),
+    }
+
+
+def health():
+    """Health of the database and search connections.
+
+    It responds with a 503 status if one of them is unavailable. Only
+    identities with the ``report`` permission get the pool statistics and
+    the built services.
+    """
+    database = {"pool": db.engine.pool.status()}
+    try:
+        db.session.execute("SELECT 1")
+        database["ok"] = True
+    except SQLAlchemyError:
+        db.session.rollback()
+        database["ok"] = False
+
+    search = {"ok": bool(current_search_client.ping())}
+    ok = database["ok"] and search["ok"]
+    status = 200 if ok else 503
+    if not _can_report():
+        return jsonify({"status": "ok" if ok else "unavailable"}), status
+
+    search.update(_search_pool_status())
+    ext = current_drafts_resources._get_current_object()
+    return jsonify({
+        "status": "ok" if ok else "unavailable",
+        "database": database,
+        "search": search,
+        "services": sorted(ext._services),
+    }), status
+
+
+def draft_changes(pid_value):
+    """Stream the changes of a draft as Server-Sent Events."""
+    service = current_drafts_resources.service("draft")
+    try:
+        draft = service.read_draft(pid_value, g.identity).record
+    except PermissionDeniedError:
+        abort(403)
+    except (PIDDoesNotExistError, NoResultFound):
+        abort(404)
+
+    subscription = current_drafts_resources.feed.subscribe(
+        feed_channel(draft)
+    )
+    # The stream outlives the request: it must not use the app context.
+    stream = event_stream(
+        subscription, draft.revision_id,
+        keepalive=current_app.config["DRAFTS_RESOURCES_FEED_KEEPALIVE"],
+    )
+    return Response(stream, mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
+
+def create_blueprint(app):
+    """Create the operational views blueprint."""
+    blueprint = Blueprint("invenio_drafts_resources", __name__)
+    blueprint.add_url_rule("/drafts/metrics", view_func=metrics)
+    blueprint.add_url_rule("/drafts/health", view_func=health)
+    blueprint.add_url_rule(
+        "/records/<pid_value>/draft/changes", view_func=draft_changes
+    )
+    return blueprint
@@ -24,6 +24,9 @@ invenio_search_version = '>=1.2.0,<2.0.0'
 invenio_db_version = '>=1.0.4,<2.0.0'
 
 extras_require = {
+    "benchmarks": ["pytest-benchmark>=3.2.3"],
+    # Brotli compression of the responses
+    "brotli": ["brotli>=1.0.7"],
     "docs": ["Sphinx>=1.5.1,<3"],
     # Elasticsearch version
     'elasticsearch6': [
@@ -43,6 +46,8 @@ extras_require = {
         'invenio-db[versioning]{}'.format(invenio_db_version),
     ],
     "tests": tests_require,
+    # Compression of the draft documents and responses
+    "zstd": ["zstandard>=0.13.0"],
 }
 
 extras_require["all"] = []
@@ -57,10 +62,13 @@ setup_requires = [
 install_requires = [
     "Flask-BabelEx>=0.9.4",
     "invenio-base>=1.2.3",
+    "invenio-celery>=1.2.0",
     "invenio-pidstore>=1.2.0",
     "invenio-indexer>=1.1.1",
     "invenio-records>=1.3.2",
     "invenio-rest>=1.2.1",
+    "jsonpatch>=1.24",
+    "jsonpointer>=1.9",
     # "flask-resources", # FIXME: Currently in dev
     # Service
     "invenio-accounts>=1.3.0",
@@ -92,16 +100,25 @@ setup(
     include_package_data=True,
     platforms="any",
     entry_points={
+        "flask.commands": [
+            "drafts = invenio_drafts_resources.cli:drafts",
+        ],
         "invenio_base.apps": [
             "invenio_drafts_resources = invenio_drafts_resources:InvenioDraftsResources",
         ],
         "invenio_base.api_apps": [
             "invenio_drafts_resources = invenio_drafts_resources:InvenioDraftsResources",
         ],
+        "invenio_base.api_blueprints": [
+            "invenio_drafts_resources = invenio_drafts_resources.views:create_blueprint",
+        ],
         'invenio_config.module': [
             'invenio_drafts_resources = invenio_drafts_resources.config',
         ],
         "invenio_i18n.translations": ["messages = invenio_drafts_resources",],
+        'invenio_celery.tasks': [
+            'invenio_drafts_resources = invenio_drafts_resources.tasks',
+        ],
         'invenio_db.models': [
             'invenio_drafts_resources = invenio_drafts_resources.drafts.models',
         ],
@@ -25,8 +25,12 @@ from invenio_records_resources.resources import RecordResource
 from invenio_records_resources.services import RecordService, \
     RecordServiceConfig
 
-from invenio_drafts_resources.drafts import DraftBase, DraftMetadataBase
-from invenio_drafts_resources.resources import DraftResource
+from invenio_drafts_resources.drafts import DraftArchiveMetadataBase, \
+    DraftBase, DraftMetadataBase, DraftOwnerCounterBase, \
+    DraftRevisionMetadataBase
+from invenio_drafts_resources.drafts.types import CompressedJSONType
+from invenio_drafts_resources.resources import DraftAutosaveResource, \
+    DraftDiffResource, DraftResource
 from invenio_drafts_resources.services import RecordDraftService, \
     RecordDraftServiceConfig
 
@@ -38,9 +42,11 @@ class AnyUserPermissionPolicy(RecordPermissionPolicy):
     can_create = [AnyUser()]
     can_read = [AnyUser()]
     can_update = [AnyUser()]
+    can_publish = [AnyUser()]
     can_delete = [AnyUser()]
     can_read_files = [AnyUser()]
     can_update_files = [AnyUser()]
+    can_report = [AnyUser()]
 
 
 class CustomDraftMetadata(db.Model, DraftMetadataBase):
@@ -49,10 +55,61 @@ class CustomDraftMetadata(db.Model, DraftMetadataBase):
     __tablename__ = 'custom_drafts_metadata'
 
 
+class CustomDraftArchiveMetadata(db.Model, DraftArchiveMetadataBase):
+    """Represent a custom draft archive."""
+
+    __tablename__ = 'custom_drafts_archive'
+
+
+class CustomDraftRevisionMetadata(db.Model, DraftRevisionMetadataBase):
+    """Represent a custom draft revision history."""
+
+    __tablename__ = 'custom_drafts_revisions'
+
+
+class CustomDraftOwnerCounter(db.Model, DraftOwnerCounterBase):
+    """Represent the custom draft counters."""
+
+    __tablename__ = 'custom_drafts_counters'
+
+
 class CustomDraft(DraftBase):
     """Custom draft API."""
 
     model_cls = CustomDraftMetadata
+    archive_model_cls = CustomDraftArchiveMetadata
+    history_model_cls = CustomDraftRevisionMetadata
+    counters_model_cls = CustomDraftOwnerCounter
+
+
+class CompressedDraftMetadata(db.Model, DraftMetadataBase):
+    """Represent a draft metadata with a compressed document."""
+
+    __tablename__ = 'compressed_drafts_metadata'
+
+    json = db.Column(
+        CompressedJSONType(), default=lambda: dict(), nullable=True
+    )
+
+
+class CompressedDraftArchiveMetadata(db.Model, DraftArchiveMetadataBase):
+    """Represent the archive of the drafts with a compressed document."""
+
+    __tablename__ = 'compressed_drafts_archive'
+
+
+class CompressedDraftOwnerCounter(db.Model, DraftOwnerCounterBase):
+    """Represent the counters of the drafts with a compressed document."""
+
+    __tablename__ = 'compressed_drafts_counters'
+
+
+class CompressedDraft(DraftBase):
+    """Draft API with a compressed document."""
+
+    model_cls = CompressedDraftMetadata
+    archive_model_cls = CompressedDraftArchiveMetadata
+    counters_model_cls = CompressedDraftOwnerCounter
 
 
 class CustomRecordMetadata(db.Model, RecordMetadataBase):
@@ -94,6 +151,8 @@ def app_config(app_config):
     https://github.com/inveniosoftware/invenio-records-permissions/issues/51
     """
     app_config["RECORDS_REST_ENDPOINTS"] = {}
+    # Views resolving their service from the extension
+    app_config["DRAFTS_RESOURCES_SERVICES"] = {"draft": _draft_service}
 
     return app_config
 
@@ -124,9 +183,17 @@ def app(app):
         draft_bp = DraftResource(
             service=_draft_service()
         ).as_blueprint("draft_resource")
+        draft_diff_bp = DraftDiffResource(
+            service=_draft_service()
+        ).as_blueprint("draft_diff_resource")
+        draft_autosave_bp = DraftAutosaveResource(
+            service=_draft_service()
+        ).as_blueprint("draft_autosave_resource")
 
         app.register_blueprint(record_bp)
         app.register_blueprint(draft_bp)
+        app.register_blueprint(draft_diff_bp)
+        app.register_blueprint(draft_autosave_bp)
         yield app
 
 
@@ -142,6 +209,18 @@ def record_service():
     return _record_service()
 
 
+@pytest.fixture(scope="module")
+def draft_cls():
+    """Draft API class fixture."""
+    return CustomDraft
+
+
+@pytest.fixture(scope="module")
+def compressed_draft_cls():
+    """Draft API class fixture, with a compressed document."""
+    return CompressedDraft
+
+
 @pytest.fixture(scope="function")
 def input_draft():
     """Minimal draft data as dict coming from the external world."""
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Response compression tests."""
+
+import gzip
+import json
+
+from flask import make_response
+
+from invenio_drafts_resources.compression import compress_response
+
+BODY = json.dumps({"title": "A title " * 1000})
+
+
+def test_compress_response(app, monkeypatch):
+    """Test large bodies are compressed as negotiated."""
+    monkeypatch.setitem(
+        app.config, "DRAFTS_RESOURCES_COMPRESSION_ENCODINGS", ["gzip"]
+    )
+    monkeypatch.setitem(
+        app.config, "DRAFTS_RESOURCES_COMPRESSION_CHUNK_SIZE", 1000
+    )
+    headers = {"Accept-Encoding": "br;q=0.5, gzip"}
+    with app.test_request_context(headers=headers):
+        # A body made of several chunks
+        response = make_response(BODY)
+        response.response = [BODY[:500].encode("utf-8"), BODY[500:]]
+        response = compress_response(response)
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in response.headers
+        assert "Accept-Encoding" in response.vary
+        assert response.is_streamed
+        body = b"".join(response.response)
+        assert len(body) < len(BODY)
+        assert gzip.decompress(body).decode("utf-8") == BODY
+
+
+def test_compress_response_skipped(app, monkeypatch):
+    """Test small bodies and unsupported encodings are left as they are."""
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        response = compress_response(make_response("{}"))
+        assert "Content-Encoding" not in response.headers
+        assert response.get_data() == b"{}"
+
+    with app.test_request_context(headers={"Accept-Encoding": "identity"}):
+        response = compress_response(make_response(BODY))
+        assert "Content-Encoding" not in response.headers
+
+    monkeypatch.setitem(
+        app.config, "DRAFTS_RESOURCES_COMPRESSION_ENABLED", False
+    )
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        response = compress_response(make_response(BODY))
+        assert "Content-Encoding" not in response.headers
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Asyncio draft service tests."""
+
+import asyncio
+
+import pytest
+from flask_principal import Identity
+from invenio_records_resources.services.errors import PermissionDeniedError
+
+from invenio_drafts_resources.services import AsyncRecordDraftService
+
+
+@pytest.fixture()
+def async_service(app, draft_service):
+    """Asyncio draft service."""
+    service = AsyncRecordDraftService(draft_service, app=app, max_workers=2)
+    yield service
+    service.shutdown()
+
+
+def _run(coroutine):
+    """Run a coroutine to completion (Python 3.6 compatible)."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_async_create_and_edit(app, async_service, record_service,
+                               input_draft, input_record, fake_identity):
+    """Test concurrent draft creations."""
+    recid = record_service.create(input_record, fake_identity).id
+
+    async def create_drafts():
+        return await asyncio.gather(
+            async_service.create(input_draft, fake_identity),
+            async_service.create(input_draft, fake_identity),
+            async_service.edit(recid, input_draft, fake_identity),
+        )
+
+    new_1, new_2, edited = _run(create_drafts())
+
+    assert new_1.id is None and new_2.id is None
+    assert new_1.record.id != new_2.record.id
+    assert edited.id == recid
+    assert edited.record["_created_by"] == input_draft["_created_by"]
+
+
+def test_async_permission_denied(app, async_service, input_draft):
+    """Test errors of the sync service are raised to the caller."""
+    with pytest.raises(PermissionDeniedError):
+        _run(async_service.create(input_draft, Identity(2)))
@@ -80,3 +80,102 @@ def test_create_draft_of_existing_record(app, client, record_service,
                        'created', 'updated', 'links']
 
     assert response.json['metadata']['title'] == orig_title
+
+
+def test_draft_diff(app, client, record_service, input_record,
+                    fake_identity):
+    """Test the changes of a draft over its record."""
+    recid = record_service.create(
+        data=input_record, identity=fake_identity
+    ).id
+
+    input_record['title'] = "Edited title"
+    response = client.post(
+        "/records/{}/draft".format(recid),
+        data=json.dumps(input_record),
+        headers=HEADERS
+    )
+    assert response.status_code == 201
+
+    response = client.get(
+        "/records/{}/draft/diff".format(recid), headers=HEADERS
+    )
+    assert response.status_code == 200
+    assert response.json['record_revision'] == 0
+    assert response.json['changes'] == [
+        {"op": "replace", "path": "/title", "value": "Edited title"}
+    ]
+
+
+def test_read_draft(app, client, record_service, input_record,
+                    fake_identity):
+    """Test reading the draft of a record."""
+    recid = record_service.create(
+        data=input_record, identity=fake_identity
+    ).id
+
+    input_record['title'] = "Edited title"
+    response = client.post(
+        "/records/{}/draft".format(recid),
+        data=json.dumps(input_record),
+        headers=HEADERS
+    )
+    assert response.status_code == 201
+
+    response = client.get("/records/{}/draft".format(recid), headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json['metadata']['title'] == "Edited title"
+
+
+def test_autosave_draft(app, client, record_service, input_record,
+                        fake_identity):
+    """Test saving a batch of edits of a draft."""
+    recid = record_service.create(
+        data=input_record, identity=fake_identity
+    ).id
+    response = client.post(
+        "/records/{}/draft".format(recid),
+        data=json.dumps(input_record),
+        headers=HEADERS
+    )
+    assert response.status_code == 201
+    revision = response.json['revision']
+
+    edits = [
+        {"op": "replace", "path": "/title", "value": "A", "timestamp": 1},
+        {"op": "replace", "path": "/title", "value": "B", "timestamp": 2},
+    ]
+    response = client.post(
+        "/records/{}/draft/autosave".format(recid),
+        data=json.dumps(edits),
+        headers=dict(HEADERS, **{"If-Match": str(revision)})
+    )
+    assert response.status_code == 200
+    assert response.json['metadata']['title'] == "B"
+    assert response.json['revision'] == revision + 1
+
+
+def test_read_draft_fields(app, client, record_service, input_record,
+                           fake_identity):
+    """Test selecting the fields of the draft response."""
+    recid = record_service.create(
+        data=input_record, identity=fake_identity
+    ).id
+    response = client.post(
+        "/records/{}/draft".format(recid),
+        data=json.dumps(input_record),
+        headers=HEADERS
+    )
+    assert response.status_code == 201
+
+    response = client.get(
+        "/records/{}/draft?fields=status,revision,metadata.title,"
+        "metadata.missing".format(recid),
+        headers=HEADERS
+    )
+    assert response.status_code == 200
+    assert response.json == {
+        "status": "draft",
+        "revision": response.json["revision"],
+        "metadata": {"title": input_record["title"]},
+    }
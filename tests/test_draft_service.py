@@ -8,6 +8,17 @@
 
 """Invenio Drafts Resources module to create REST APIs"""
 
+import pytest
+from flask_principal import Identity
+from invenio_db import db
+from invenio_pidstore.errors import PIDDoesNotExistError
+from invenio_records_resources.services.errors import PermissionDeniedError
+from invenio_rest.errors import RESTValidationError
+from sqlalchemy.orm.exc import NoResultFound
+
+from invenio_drafts_resources.services.errors import DraftConflictRESTError
+from invenio_drafts_resources.tasks import archive_drafts, publish_draft
+
 
 def test_create_draft_of_new_record(app, draft_service, input_draft,
                                     fake_identity):
@@ -56,3 +67,275 @@ def test_create_draft_of_existing_record(app, draft_service, record_service,
     identified_record = record_service.read(id_=recid, identity=fake_identity)
 
     assert identified_record.record['title'] == orig_title
+
+
+def test_permission_cache(app, draft_service, fake_identity):
+    """Test caching of identity-only permission checks."""
+    draft_service.invalidate_permissions()
+
+    draft_service.require_permission(fake_identity, "create")
+    draft_service.require_permission(fake_identity, "create")
+    assert len(draft_service._permission_cache) == 1
+
+    draft_service.invalidate_permissions(action_name="read")
+    assert len(draft_service._permission_cache) == 1
+
+    draft_service.invalidate_permissions(identity=fake_identity)
+    assert len(draft_service._permission_cache) == 0
+
+
+def test_require_permission_many(app, draft_service, input_draft,
+                                 fake_identity):
+    """Test permission checks over many drafts at once."""
+    drafts = [
+        draft_service.create(data=input_draft, identity=fake_identity).record
+        for _ in range(3)
+    ]
+
+    draft_service.require_permission_many(fake_identity, "read", drafts)
+
+    # Actions without generators are disabled
+    with pytest.raises(PermissionDeniedError):
+        draft_service.require_permission_many(
+            fake_identity, "undefined", drafts
+        )
+
+
+def test_update_merges_concurrent_changes(app, draft_service, input_draft,
+                                          fake_identity):
+    """Test concurrent updates of a draft are merged."""
+    draft = draft_service.create(
+        data=input_draft, identity=fake_identity
+    ).record
+    id_ = str(draft.id)
+    base_revision = draft.revision_id
+
+    # Two clients edit the same revision
+    first = dict(input_draft, title="A title")
+    second = dict(input_draft, description="A description")
+    draft_service.update(id_, first, fake_identity, revision_id=base_revision)
+    updated = draft_service.update(
+        id_, second, fake_identity, revision_id=base_revision
+    ).record
+
+    assert updated["title"] == "A title"
+    assert updated["description"] == "A description"
+    assert updated.revision_id == base_revision + 2
+
+    # Changes to the same value conflict
+    third = dict(input_draft, title="Another title")
+    with pytest.raises(DraftConflictRESTError):
+        draft_service.update(
+            id_, third, fake_identity, revision_id=base_revision
+        )
+
+
+def test_diff(app, draft_service, record_service, input_record,
+              fake_identity):
+    """Test the diff of a draft is computed once per revision."""
+    recid = record_service.create(
+        data=input_record, identity=fake_identity
+    ).id
+    input_record["title"] = "Edited title"
+    draft_service.edit(data=input_record, identity=fake_identity, id_=recid)
+
+    diff = draft_service.diff(recid, fake_identity)
+    assert diff["changes"] == [
+        {"op": "replace", "path": "/title", "value": "Edited title"}
+    ]
+
+    # Changing a returned diff does not change the cached one
+    diff["changes"][0]["value"] = "Changed"
+    diff["changes"].append({"op": "remove", "path": "/title"})
+    assert draft_service.diff(recid, fake_identity)["changes"] == [
+        {"op": "replace", "path": "/title", "value": "Edited title"}
+    ]
+
+
+def test_stale_drafts(app, draft_service, record_service, input_record,
+                      fake_identity):
+    """Test detection of drafts whose record changed since the fork."""
+    recid = record_service.create(
+        data=input_record, identity=fake_identity
+    ).id
+    unit = draft_service.edit(
+        data=input_record, identity=fake_identity, id_=recid
+    )
+    assert unit.stale is False
+    draft = unit.record
+    assert not draft_service.is_stale(draft)
+
+    record_service.update(
+        id_=recid, data=dict(input_record, title="New"),
+        identity=fake_identity
+    )
+    assert draft_service.is_stale(draft)
+
+    report = {
+        d["draft_id"]: d for d in draft_service.stale_drafts(fake_identity)
+    }
+    assert report[draft.id]["fork_revision_id"] == 0
+    assert report[draft.id]["record_revision_id"] == 1
+
+    # Published drafts are not reported
+    draft.model.status = "published"
+    db.session.commit()
+    report = draft_service.stale_drafts(fake_identity)
+    assert draft.id not in {d["draft_id"] for d in report}
+
+    # Permissions are checked on call
+    with pytest.raises(PermissionDeniedError):
+        draft_service.stale_drafts(Identity(2))
+
+
+def test_shared_indexer_and_validator(app, draft_service, input_draft):
+    """The indexer and the validator schema are created once."""
+    assert draft_service.indexer() is draft_service.indexer()
+
+    validator = draft_service.data_validator()
+    validator.validate(input_draft)
+    schema = validator._schema
+    validator.validate(input_draft)
+    assert validator._schema is schema
+
+
+def test_read_draft(app, draft_service, record_service, input_record,
+                    fake_identity):
+    """Test reading the draft of a record and of a new record."""
+    recid = record_service.create(input_record, fake_identity).id
+    draft_service.edit(recid, input_record, fake_identity)
+
+    draft = draft_service.read_draft(recid, fake_identity)
+    assert draft.id == recid
+    assert draft.record["title"] == input_record["title"]
+    assert draft.stale is False
+
+    new_draft = draft_service.create(input_record, fake_identity).record
+    assert draft_service.read_draft(
+        str(new_draft.id), fake_identity
+    ).record.id == new_draft.id
+
+
+def test_autosave(app, draft_service, record_service, input_record,
+                  fake_identity):
+    """Test a batch of edits is saved as a single revision."""
+    recid = record_service.create(input_record, fake_identity).id
+    draft = draft_service.edit(recid, input_record, fake_identity).record
+    revision_id = draft.revision_id
+
+    edits = [
+        {"op": "replace", "path": "/title", "value": "Second",
+         "timestamp": 2},
+        {"op": "replace", "path": "/title", "value": "First",
+         "timestamp": 1},
+        {"op": "remove", "path": "/description", "timestamp": 3},
+    ]
+    draft = draft_service.autosave(recid, edits, fake_identity).record
+
+    assert draft.revision_id == revision_id + 1
+    assert draft["title"] == "Second"
+    assert "description" not in draft
+
+    with pytest.raises(RESTValidationError):
+        draft_service.autosave(
+            recid, [{"op": "remove", "path": "/missing"}], fake_identity
+        )
+    invalid = [
+        [{"op": "move", "from": "/title", "path": "/other"}],
+        {"op": "remove", "path": "/title"},
+        ["remove"],
+        [{"op": "remove", "path": "/title", "timestamp": 1},
+         {"op": "remove", "path": "/title", "timestamp": "2"}],
+        [{"op": "replace", "path": "/title", "value": "A", "timestamp": 1},
+         {"op": "replace", "path": "/title", "value": "B"}],
+    ]
+    for edits in invalid:
+        with pytest.raises(RESTValidationError):
+            draft_service.autosave(recid, edits, fake_identity)
+    # Failed batches leave the draft as it was
+    assert draft_service.read_draft(recid, fake_identity).record == draft
+
+
+def test_publish(app, draft_service, record_service, input_record,
+                 fake_identity):
+    """Test publishing a draft of a new record, also in the background."""
+    draft = draft_service.create(
+        data=input_record, identity=fake_identity
+    ).record
+    steps = []
+
+    published = draft_service.publish(
+        str(draft.id), fake_identity,
+        progress=lambda done, total: steps.append((done, total))
+    )
+
+    assert steps == [(1, 2), (2, 2)]
+    record = record_service.read(published.id, fake_identity).record
+    assert record["title"] == input_record["title"]
+    draft = draft_service.resolve_draft(str(draft.id))[1]
+    assert draft.status == "published"
+    assert draft.fork_id == record.id
+
+    # Retries only reindex the record
+    draft_service._publish(None, draft, reindex_only=True)
+    assert record_service.read(
+        published.id, fake_identity
+    ).record.revision_id == record.revision_id
+
+    # Published drafts can be edited and published again
+    draft_service.update(
+        str(draft.id), dict(input_record, title="New title"), fake_identity
+    )
+    result = publish_draft.apply(args=(str(draft.id), ))
+    assert result.successful()
+    assert result.result == published.id
+    record = record_service.read(published.id, fake_identity).record
+    assert record["title"] == "New title"
+
+    job = draft_service.publish_in_background(str(draft.id), fake_identity)
+    assert job["id"].startswith(str(draft.id))
+    assert draft_service.publish_status(
+        job["id"], fake_identity
+    )["id"] == job["id"]
+    with pytest.raises(PIDDoesNotExistError):
+        draft_service.publish_status("not-a-job", fake_identity)
+
+    # The job of a deleted draft is not found
+    draft_service.resolve_draft(str(draft.id))[1].delete()
+    db.session.commit()
+    with pytest.raises(PIDDoesNotExistError):
+        draft_service.publish_status(job["id"], fake_identity)
+
+
+def test_archive_task(app, draft_service, input_record, fake_identity):
+    """Test the periodic task archives the published drafts."""
+    draft = draft_service.create(
+        data=input_record, identity=fake_identity
+    ).record
+    draft_service.publish(str(draft.id), fake_identity)
+
+    result = archive_drafts.apply(kwargs=dict(expired_days=30))
+    assert result.result >= 1
+    draft_cls = draft_service.config.draft_cls
+    with pytest.raises(NoResultFound):
+        draft_cls.get_record(draft.id)
+    assert draft_cls.get_archived(draft.id).status == "published"
+
+
+def test_revisions(app, draft_service, input_record, fake_identity):
+    """Test listing and reading the revisions of a draft."""
+    draft = draft_service.create(
+        data=input_record, identity=fake_identity
+    ).record
+    draft_service.update(
+        str(draft.id), dict(input_record, title="New title"), fake_identity
+    )
+
+    revisions = draft_service.list_revisions(str(draft.id), fake_identity)
+    assert revisions["total"] == 2
+    assert [r["revision_id"] for r in revisions["hits"]] == [1, 0]
+    assert draft_service.read_revision(
+        str(draft.id), 0, fake_identity
+    )["title"] == input_record["title"]
+    with pytest.raises(PIDDoesNotExistError):
+        draft_service.read_revision(str(draft.id), 5, fake_identity)
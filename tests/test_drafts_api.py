@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Drafts data access layer tests."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from invenio_db import db
+from sqlalchemy.orm.exc import NoResultFound
+from sqlalchemy_continuum import version_class
+
+from invenio_drafts_resources.drafts.counters import get_counters, \
+    reconcile_counters
+from invenio_drafts_resources.drafts.merge import MergeConflict, \
+    three_way_merge
+from invenio_drafts_resources.drafts.ndjson import export_drafts, import_drafts
+
+
+def test_metadata_query_defers_json(app, draft_cls, input_draft):
+    """Test metadata-only loading does not fetch the JSON column."""
+    draft = draft_cls.create(input_draft)
+    db.session.commit()
+    draft_id = draft.id
+    db.session.expunge_all()
+
+    model = draft_cls.get_metadata(draft_id)
+    assert model.status == "draft"
+    assert model.version_id == 1
+    assert "json" not in model.__dict__
+
+    # Accessing the document loads it on demand
+    assert model.json["_created_by"] == input_draft["_created_by"]
+
+
+def test_get_drafts(app, draft_cls, input_draft):
+    """Test fetching many drafts at once preserving the order."""
+    drafts = [draft_cls.create(input_draft) for _ in range(5)]
+    db.session.commit()
+    ids = [d.id for d in reversed(drafts)]
+
+    # Chunking
+    draft_cls.fetch_chunk_size = 2
+    try:
+        db.session.expunge_all()
+        fetched = draft_cls.get_drafts(ids)
+    finally:
+        del draft_cls.fetch_chunk_size
+    assert [d.id for d in fetched] == ids
+
+    # Identity map reuse and string ids
+    fetched = draft_cls.get_drafts([str(i) for i in ids[:2]])
+    assert [d.id for d in fetched] == ids[:2]
+
+    # Deferred models in the identity map are fetched with the others
+    db.session.expunge_all()
+    draft_cls.get_metadata(ids[0])
+    draft_cls.get_metadata(ids[1])
+    draft_cls.get_record(ids[2])
+    fetched = draft_cls.get_drafts(ids)
+    assert [d.id for d in fetched] == ids
+    assert all(d["_owners"] == [1] for d in fetched)
+
+    # Deleted drafts are skipped unless requested
+    fetched[0].delete()
+    db.session.commit()
+    assert len(draft_cls.get_drafts(ids)) == 4
+    assert len(draft_cls.get_drafts(ids, with_deleted=True)) == 5
+
+
+def test_export_import_drafts(app, draft_cls, input_draft):
+    """Test the NDJSON export/import round trip keeps the drafts."""
+    draft = draft_cls.create(input_draft)
+    db.session.commit()
+    lines = list(export_drafts(draft_cls.model_cls, chunk_size=2))
+    exported = {json.loads(line)["id"]: line for line in lines}
+    assert str(draft.id) in exported
+
+    draft_cls.model_cls.query.delete()
+    db.session.commit()
+
+    assert import_drafts(draft_cls.model_cls, lines, batch_size=2) == \
+        len(lines)
+    imported = draft_cls.get_record(draft.id)
+    assert imported == draft
+    assert imported.revision_id == draft.revision_id
+    assert imported.status == draft.status
+
+
+def test_archive(app, draft_cls, input_draft):
+    """Test drafts in a terminal state are moved to the archive."""
+    published, expired, live = [
+        draft_cls.create(input_draft) for _ in range(3)
+    ]
+    published.model.status = "published"
+    expired.model.expiry_date = datetime.utcnow() - timedelta(days=2)
+    live.model.expiry_date = None
+    for draft in (published, expired, live):
+        draft.commit()
+    db.session.commit()
+
+    assert draft_cls.archive(batch_size=1) == 1
+    assert draft_cls.archive(
+        expired_before=datetime.utcnow() - timedelta(days=1)
+    ) == 1
+
+    for draft in (published, expired):
+        with pytest.raises(NoResultFound):
+            draft_cls.get_record(draft.id)
+    assert draft_cls.get_record(live.id).id == live.id
+
+    archived = draft_cls.get_archived(published.id)
+    assert archived.status == "published"
+    history = draft_cls.history_model_cls.query
+    assert history.filter_by(draft_id=published.id).count() == 0
+    assert history.filter_by(draft_id=live.id).count() > 0
+    versions = version_class(draft_cls.model_cls).query
+    assert versions.filter_by(id=published.id).count() == 0
+    assert versions.filter_by(id=live.id).count() > 0
+    assert archived["_created_by"] == input_draft["_created_by"]
+    with pytest.raises(NoResultFound):
+        draft_cls.get_archived(live.id)
+
+
+def test_compressed_drafts(app, compressed_draft_cls, input_draft):
+    """Test export/import and archival of compressed documents."""
+    draft_cls = compressed_draft_cls
+    draft = draft_cls.create(input_draft)
+    db.session.commit()
+    lines = list(export_drafts(draft_cls.model_cls))
+    assert json.loads(lines[0])["json"] == dict(draft)
+
+    draft_cls.model_cls.query.delete()
+    draft_cls.counters_model_cls.query.delete()
+    db.session.commit()
+    assert import_drafts(draft_cls.model_cls, lines) == 1
+    imported = draft_cls.get_record(draft.id)
+    assert imported == draft
+
+    # Documents are decompressed into the archive
+    reconcile_counters(draft_cls)
+    imported.model.status = "published"
+    imported.commit()
+    db.session.commit()
+    assert draft_cls.archive() == 1
+    assert draft_cls.get_archived(draft.id) == draft
+    assert get_counters(draft_cls.counters_model_cls, 1) == {}
+
+
+def test_revision_history(app, draft_cls, input_draft):
+    """Test revisions are stored as snapshots and deltas and rebuilt."""
+    draft_cls.history_snapshot_interval = 3
+    try:
+        draft = draft_cls.create(input_draft)
+        db.session.commit()
+        documents = [dict(draft)]
+        for i in range(5):
+            draft["title"] = "Title {}".format(i)
+            draft.commit()
+            db.session.commit()
+            documents.append(dict(draft))
+    finally:
+        del draft_cls.history_snapshot_interval
+
+    for revision_id, document in enumerate(documents):
+        assert draft.get_revision(revision_id) == document
+    with pytest.raises(IndexError):
+        draft.get_revision(6)
+
+    total, revisions = draft.list_revisions(page=2, size=4)
+    assert total == 6
+    assert [r.revision_id for r in revisions] == [1, 0]
+    assert [r.is_snapshot for r in revisions] == [False, True]
+    assert revisions[0].document == documents[1]
+
+    snapshots = draft_cls.history_model_cls.query.filter_by(
+        draft_id=draft.id).filter(
+        draft_cls.history_model_cls.snapshot != None  # noqa
+    ).count()
+    assert snapshots == 2
+
+    # A missing patch is not silently skipped
+    draft_cls.history_model_cls.query.filter_by(
+        draft_id=draft.id, revision_id=4).delete()
+    db.session.commit()
+    with pytest.raises(IndexError):
+        draft.get_revision(5)
+
+
+def test_revisions_without_history(app, compressed_draft_cls, input_draft):
+    """Test revisions are taken from the versions without a history."""
+    draft = compressed_draft_cls.create(input_draft)
+    db.session.commit()
+    first = dict(draft)
+    draft["title"] = "New title"
+    draft.commit()
+    db.session.commit()
+
+    assert draft.get_revision(0) == first
+    total, revisions = draft.list_revisions(size=1)
+    assert total == 2
+    assert [r.revision_id for r in revisions] == [1]
+    assert revisions[0].document["title"] == "New title"
+
+
+def test_owner_counters(app, draft_cls, input_draft):
+    """Test the per-owner counters follow the drafts and are reconciled."""
+    # Owners of no other draft of the module
+    counters_cls = draft_cls.counters_model_cls
+    data = dict(input_draft, _owners=[1001], _created_by=1001)
+    first, second = [draft_cls.create(data) for _ in range(2)]
+    for draft in (first, second):
+        draft.model.expiry_date = datetime(2030, 1, 1)
+        draft.commit()
+    db.session.commit()
+    assert get_counters(counters_cls, 1001) == {
+        "status:draft": 2, "expires:2030-01-01": 2,
+    }
+
+    first.model.status = "published"
+    first["_owners"] = [1001, 1002]
+    first.commit()
+    second.delete(force=True)
+    db.session.commit()
+
+    expected = {"status:published": 1, "expires:2030-01-01": 1}
+    assert get_counters(counters_cls, 1001) == expected
+    assert get_counters(counters_cls, 1002) == expected
+
+    # Drift is repaired by the reconciliation
+    counters_cls.query.filter_by(owner_id=1001).delete()
+    db.session.commit()
+    reconcile_counters(draft_cls)
+    assert get_counters(counters_cls, 1001) == expected
+    assert get_counters(counters_cls, 1002) == expected
+    assert counters_cls.query.filter(counters_cls.count < 0).count() == 0
+
+
+def test_three_way_merge():
+    """Test merging non-overlapping changes and detecting conflicts."""
+    base = {"title": "A", "meta": {"a": 1, "b": 2}, "tags": ["x"]}
+    ours = {"title": "B", "meta": {"a": 1, "b": 2}, "tags": ["x"]}
+    theirs = {"title": "A", "meta": {"a": 1, "c": 3}, "tags": ["x", "y"]}
+
+    assert three_way_merge(base, ours, theirs) == {
+        "title": "B", "meta": {"a": 1, "c": 3}, "tags": ["x", "y"]
+    }
+
+    ours = dict(base, meta={"a": 5, "b": 2}, tags=["z"])
+    with pytest.raises(MergeConflict) as excinfo:
+        three_way_merge(base, ours, theirs)
+    assert excinfo.value.paths == ["/tags"]
+
+
+def test_three_way_merge_conflict_paths():
+    """Test conflict paths are escaped JSON pointers."""
+    base = {"a/b": {"c~d": 1}}
+    ours = {"a/b": {"c~d": 2}}
+    theirs = {"a/b": {"c~d": 3}}
+
+    with pytest.raises(MergeConflict) as excinfo:
+        three_way_merge(base, ours, theirs)
+    assert excinfo.value.paths == ["/a~1b/c~0d"]
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Extension tests."""
+
+import subprocess
+import sys
+
+import pytest
+
+from invenio_drafts_resources.proxies import current_drafts_resources
+from invenio_drafts_resources.resources import DraftResource
+from invenio_drafts_resources.services import RecordDraftService
+
+
+def test_lazy_registry(app):
+    """Services and resources are built once, on first use."""
+    ext = current_drafts_resources._get_current_object()
+    assert "draft" not in ext._services
+
+    service = ext.service("draft")
+    assert isinstance(service, RecordDraftService)
+    assert ext.service("draft") is service
+
+    resource = ext.resource("draft")
+    assert isinstance(resource, DraftResource)
+    assert ext.resource("draft") is resource
+    assert resource.service is service
+
+
+def test_resource_lazy_service(app):
+    """The default service of a resource is only built when accessed."""
+    resource = DraftResource()
+    assert resource._service is None
+    assert resource.service is current_drafts_resources.service("draft")
+
+    service = RecordDraftService()
+    assert DraftResource(service=service).service is service
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="needs -X importtime")
+def test_import_time():
+    """Importing the extension doesn't import the services and resources."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import invenio_drafts_resources.ext, "
+         "invenio_drafts_resources.proxies"],
+        stderr=subprocess.PIPE, check=True, universal_newlines=True,
+    ).stderr
+    modules = [line.rsplit("|", 1)[-1].strip() for line in stderr.splitlines()]
+
+    assert "invenio_drafts_resources.ext" in modules
+    assert "invenio_drafts_resources.services" not in modules
+    assert "invenio_drafts_resources.resources" not in modules
@@ -16,3 +16,10 @@ from invenio_drafts_resources.resources import DraftFileActionResource, \
 HEADERS = {"content-type": "application/json", "accept": "application/json"}
 
 # TODO: IMPLEMENT ME!
+
+
+def test_file_action_resource_config():
+    """Test the file action resource is built with its own config."""
+    resource = DraftFileActionResource()
+    assert resource.config.list_route == \
+        DraftFileActionResourceConfig.list_route
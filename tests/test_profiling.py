@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Profiling tests."""
+
+import json
+
+from flask import g
+from invenio_records_resources.services.errors import PermissionDeniedError
+
+from invenio_drafts_resources.profiling import PhaseMetrics, RequestProfile, \
+    timed
+from invenio_drafts_resources.services import RecordDraftService
+
+HEADERS = {"content-type": "application/json", "accept": "application/json"}
+
+
+def test_timed_is_noop_without_profile(app):
+    """Test phases are not recorded when not profiling."""
+    with app.test_request_context():
+        with timed("validation"):
+            pass
+        assert g.get("drafts_profile") is None
+
+
+def test_timed_records_phases(app):
+    """Test phases are recorded in the request profile and metrics."""
+    metrics = app.extensions["invenio-drafts-resources"].metrics
+    with app.test_request_context():
+        g.drafts_profile = profile = RequestProfile()
+        with timed("validation"):
+            profile.queries += 2
+        with timed("validation"):
+            pass
+
+        duration, queries = profile.phases["validation"]
+        assert queries == 2
+        assert profile.server_timing().startswith("validation;dur=")
+
+    assert 'drafts_phase_duration_seconds_count{phase="validation"}' in \
+        metrics.render()
+
+
+def test_metrics_render():
+    """Test the Prometheus histogram is cumulative."""
+    metrics = PhaseMetrics()
+    metrics.observe("indexing", 0.02, 1)
+    metrics.observe("indexing", 3, 0)
+    output = metrics.render()
+
+    assert 'drafts_phase_duration_seconds_bucket{phase="indexing",' \
+        'le="0.025"} 1' in output
+    assert 'drafts_phase_duration_seconds_bucket{phase="indexing",' \
+        'le="+Inf"} 2' in output
+    assert 'drafts_phase_queries_total{phase="indexing"} 1' in output
+
+
+def test_only_draft_resources_profiled(app, client, record_service,
+                                       input_record, fake_identity,
+                                       monkeypatch):
+    """Test only the requests to the draft resources are profiled."""
+    monkeypatch.setitem(app.config, "DRAFTS_RESOURCES_PROFILING_ENABLED",
+                        True)
+    recid = record_service.create(input_record, fake_identity).id
+
+    response = client.post(
+        "/records/{}/draft".format(recid),
+        data=json.dumps(input_record),
+        headers=HEADERS
+    )
+    assert response.status_code == 201
+    assert "Server-Timing" in response.headers
+
+    response = client.get("/drafts/health")
+    assert "Server-Timing" not in response.headers
+
+
+def test_metrics_permission(app, client, monkeypatch):
+    """Test the metrics require the report permission."""
+    monkeypatch.setitem(app.config, "DRAFTS_RESOURCES_PROFILING_ENABLED",
+                        True)
+    assert client.get("/drafts/metrics").status_code == 200
+
+    def deny(self, identity, action_name, **kwargs):
+        raise PermissionDeniedError(action_name)
+
+    monkeypatch.setattr(RecordDraftService, "require_permission", deny)
+    assert client.get("/drafts/metrics").status_code == 403
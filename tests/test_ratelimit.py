@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Rate limiting tests."""
+
+import json
+
+import pytest
+from flask import Flask
+
+from invenio_drafts_resources import InvenioDraftsResources
+from invenio_drafts_resources.ratelimit import MemoryBackend
+
+HEADERS = {"content-type": "application/json", "accept": "application/json"}
+
+
+def test_memory_backend():
+    """Test the token bucket."""
+    backend = MemoryBackend()
+
+    assert backend.consume("a", rate=1, burst=2) == 0
+    assert backend.consume("a", rate=1, burst=2) == 0
+    wait = backend.consume("a", rate=1, burst=2)
+    assert 0 < wait <= 1
+    # Other buckets are independent.
+    assert backend.consume("b", rate=1, burst=2) == 0
+
+
+def test_memory_backend_consume_all():
+    """Test tokens are taken from all the buckets or from none."""
+    backend = MemoryBackend()
+    limits = [("user", 0.01, 3), ("draft", 0.01, 1)]
+
+    assert backend.consume_all(limits) == 0
+    assert backend.consume_all(limits) > 0
+    assert backend.consume_all(limits) > 0
+    # The denied requests did not drain the user bucket.
+    assert backend.consume("user", rate=0.01, burst=3) == 0
+    assert backend.consume("user", rate=0.01, burst=3) == 0
+    assert backend.consume("user", rate=0.01, burst=3) > 0
+
+
+@pytest.mark.parametrize("limit", [(0, 10), (1, -1), (1,), ("1", 10)])
+def test_invalid_limits(limit):
+    """Test rate limits are validated with the configuration."""
+    app = Flask("testapp")
+    app.config["DRAFTS_RESOURCES_RATELIMIT_DRAFT"] = limit
+    with pytest.raises(ValueError):
+        InvenioDraftsResources(app)
+
+
+def test_draft_writes_rate_limited(app, client, record_service, input_record,
+                                   fake_identity, monkeypatch):
+    """Test writes over a draft get a 429 when over the limit."""
+    recid = record_service.create(
+        data=input_record, identity=fake_identity
+    ).id
+
+    monkeypatch.setitem(app.config, "DRAFTS_RESOURCES_RATELIMIT_ENABLED",
+                        True)
+    monkeypatch.setitem(app.config, "DRAFTS_RESOURCES_RATELIMIT_DRAFT",
+                        (0.01, 2))
+    responses = [
+        client.post(
+            "/records/{}/draft".format(recid),
+            data=json.dumps(input_record),
+            headers=HEADERS
+        )
+        for _ in range(3)
+    ]
+
+    assert [r.status_code for r in responses] == [201, 201, 429]
+    assert int(responses[-1].headers["Retry-After"]) > 0
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Reindex tests."""
+
+from invenio_db import db
+from invenio_indexer.api import RecordIndexer
+from invenio_search import current_search_client
+from invenio_search.utils import build_alias_name
+
+from invenio_drafts_resources.reindex import ReindexState, catch_up
+
+
+def test_catch_up(app, draft_cls, input_draft, tmpdir):
+    """Test the drafts written during a reindex end up in the new index."""
+    index = build_alias_name("drafts-catch-up-test")
+    state = ReindexState(
+        str(tmpdir.join("state.json")), alias="drafts", index=index,
+        partitions=1,
+    )
+    draft = draft_cls.create(input_draft)
+    db.session.commit()
+
+    try:
+        assert catch_up(draft_cls, RecordIndexer, state) >= 1
+        current_search_client.indices.refresh(index=index)
+        assert current_search_client.get(index=index, id=str(draft.id))
+
+        # Deleted drafts are removed from the new index
+        draft.delete()
+        db.session.commit()
+        assert catch_up(draft_cls, RecordIndexer, state) == 1
+        current_search_client.indices.refresh(index=index)
+        assert not current_search_client.exists(index=index, id=str(draft.id))
+    finally:
+        current_search_client.indices.delete(index=index, ignore=[404])
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Resource units tests."""
+
+from collections import namedtuple
+from datetime import datetime
+
+from invenio_records_resources.resource_units import IdentifiedRecord
+
+from invenio_drafts_resources.resource_units import DraftProjection, \
+    IdentifiedRecordDraft
+
+PID = namedtuple("PID", ["pid_value"])
+Model = namedtuple(
+    "Model", ["id", "version_id", "status", "expiry_date", "created",
+              "updated"]
+)
+
+
+def test_draft_unit_interface():
+    """Test the draft unit keeps the record unit interface."""
+    pid = PID("12345")
+    unit = IdentifiedRecordDraft(pid=pid, record=None)
+    assert unit.id == "12345"
+    assert unit.pids == [pid]
+    assert isinstance(unit, IdentifiedRecord)
+    assert not unit.__dict__
+
+    unit = IdentifiedRecordDraft()
+    assert unit.id is None
+    assert unit.pids == []
+
+
+def test_draft_projection():
+    """Test the projection unit is built from the model columns."""
+    now = datetime.utcnow()
+    model = Model("uuid", 3, "draft", now, now, now)
+    unit = DraftProjection.from_model(model, pid=PID("12345"))
+
+    assert unit.id == "12345"
+    assert unit.draft_id == "uuid"
+    assert unit.revision_id == 2
+    assert unit.is_revision(2)
+    assert unit.status == "draft"
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Read replica routing tests."""
+
+import uuid
+from collections import namedtuple
+
+import pytest
+from flask_principal import Identity
+from invenio_db import db
+from sqlalchemy.orm.exc import NoResultFound
+
+from invenio_drafts_resources.routing import PrimaryPins, ReadReplica
+
+FakeDraft = namedtuple("FakeDraft", ["id", "revision_id"])
+
+DRAFT_ID = uuid.uuid4()
+
+
+@pytest.fixture()
+def replica(app):
+    """Read replica (not connected) with the pins of the users."""
+    replica = ReadReplica("sqlite://", PrimaryPins(seconds=60))
+    yield replica
+    replica.remove()
+
+
+def _loader(replica_revision, primary_revision):
+    """Loader returning a different draft revision per session."""
+    sessions = []
+
+    def loader(session):
+        sessions.append("primary" if session is db.session else "replica")
+        if session is db.session:
+            return None, FakeDraft(DRAFT_ID, primary_revision)
+        if replica_revision is None:
+            raise NoResultFound()
+        return None, FakeDraft(DRAFT_ID, replica_revision)
+
+    return loader, sessions
+
+
+def test_reads_go_to_replica(replica):
+    """Test drafts are read from the replica by default."""
+    loader, sessions = _loader(1, 2)
+    _, draft = replica.read(Identity(1), loader)
+
+    assert draft.revision_id == 1
+    assert sessions == ["replica"]
+
+
+def test_read_your_writes(replica):
+    """Test a user reads the draft they wrote from the primary if needed."""
+    replica.pin(Identity(1), FakeDraft(DRAFT_ID, 2))
+
+    loader, sessions = _loader(1, 2)
+    _, draft = replica.read(Identity(1), loader)
+    assert draft.revision_id == 2
+    assert sessions == ["replica", "primary"]
+
+    # Other users are not pinned.
+    loader, sessions = _loader(1, 2)
+    assert replica.read(Identity(2), loader)[1].revision_id == 1
+
+    # Not replicated yet.
+    loader, sessions = _loader(None, 2)
+    assert replica.read(Identity(1), loader)[1].revision_id == 2
+    loader, sessions = _loader(None, 2)
+    with pytest.raises(NoResultFound):
+        replica.read(Identity(2), loader)
+
+    # Caught up.
+    loader, sessions = _loader(2, 2)
+    replica.read(Identity(1), loader)
+    assert sessions == ["replica"]
+
+
+def test_pins_expire():
+    """Test the pins expire."""
+    pins = PrimaryPins(seconds=0)
+    pins.pin(1, DRAFT_ID, 2)
+
+    assert pins.revision(1, DRAFT_ID) is None
+    assert not pins.pinned(1)
+
+
+def test_anonymous_users_pinned_by_address(app, replica):
+    """Test anonymous users do not share their pins."""
+    with app.test_request_context(environ_base={"REMOTE_ADDR": "10.0.0.1"}):
+        replica.pin(Identity(None), FakeDraft(DRAFT_ID, 2))
+        loader, sessions = _loader(1, 2)
+        assert replica.read(Identity(None), loader)[1].revision_id == 2
+
+    with app.test_request_context(environ_base={"REMOTE_ADDR": "10.0.0.2"}):
+        loader, sessions = _loader(1, 2)
+        assert replica.read(Identity(None), loader)[1].revision_id == 1
+
+    # Not pinned out of requests
+    replica.pin(Identity(None), FakeDraft(DRAFT_ID, 3))
+    assert not replica.pins.pinned(None)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Column types tests."""
+
+import pytest
+
+from invenio_drafts_resources.drafts.types import CompressedJSONType, \
+    train_dictionary, zstandard
+
+DOCUMENTS = [
+    {"title": "Draft {}".format(i), "description": "lorem ipsum " * 100,
+     "creators": [{"name": "Doe, John", "affiliation": "CERN"}]}
+    for i in range(20)
+]
+
+
+@pytest.mark.parametrize("codec", [
+    "zlib",
+    pytest.param("zstd", marks=pytest.mark.skipif(
+        zstandard is None, reason="zstandard not installed")),
+])
+def test_compressed_json_type(codec):
+    """Test documents are compressed and restored."""
+    dictionary = train_dictionary(DOCUMENTS[1:], size=4096)
+    plain = CompressedJSONType(codec=codec)
+    with_dict = CompressedJSONType(codec=codec, dictionary=lambda: dictionary)
+    document = DOCUMENTS[0]
+
+    for column_type in (plain, with_dict):
+        value = column_type.process_bind_param(document, None)
+        assert len(value) < len(str(document)) / 4
+        assert column_type.process_result_value(value, None) == document
+        assert column_type.process_bind_param(None, None) is None
+        assert column_type.process_result_value(None, None) is None
+
+    # The dictionary helps on small documents.
+    assert len(with_dict.process_bind_param(document, None)) < \
+        len(plain.process_bind_param(document, None))
+    # Values compressed without dictionary stay readable.
+    assert with_dict.process_result_value(
+        plain.process_bind_param(document, None), None) == document
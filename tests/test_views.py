@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Invenio-Drafts-Resources is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Views tests."""
+
+import json
+
+from invenio_records_resources.services.errors import PermissionDeniedError
+
+from invenio_drafts_resources.feed import feed_channel
+from invenio_drafts_resources.services import RecordDraftService
+
+
+def test_health(app, client):
+    """Test the health endpoint reports the connection pools."""
+    response = client.get("/drafts/health")
+
+    assert response.status_code == 200
+    data = response.json
+    assert data["status"] == "ok"
+    assert data["database"]["ok"]
+    assert isinstance(data["database"]["pool"], str)
+    assert data["search"]["ok"]
+    assert data["search"]["connections"]
+
+
+def test_health_without_report_permission(app, client, monkeypatch):
+    """Test the health endpoint only reports the status to others."""
+    def deny(self, identity, action_name, **kwargs):
+        raise PermissionDeniedError(action_name)
+
+    monkeypatch.setattr(RecordDraftService, "require_permission", deny)
+    response = client.get("/drafts/health")
+
+    assert response.status_code == 200
+    assert response.json == {"status": "ok"}
+
+
+def test_draft_changes_feed(app, client, draft_service, record_service,
+                            input_record, fake_identity):
+    """Test the changes of a draft are streamed as Server-Sent Events."""
+    recid = record_service.create(input_record, fake_identity).id
+    draft = draft_service.edit(recid, input_record, fake_identity).record
+
+    response = client.get("/records/{}/draft/changes".format(recid))
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    events = response.iter_encoded()
+
+    event = next(events).decode("utf-8")
+    assert event.startswith("id: {}\nevent: revision\n".format(
+        draft.revision_id))
+
+    input_record["title"] = "Changed title"
+    draft_service.update(recid, input_record, fake_identity)
+
+    event = next(events).decode("utf-8")
+    assert "event: change" in event
+    data = json.loads(event.split("data: ", 1)[1])
+    assert data["revision_id"] == draft.revision_id + 1
+    assert {"op": "replace", "path": "/title", "value": "Changed title"} \
+        in data["patch"]
+
+    draft_service.publish(recid, fake_identity)
+    event = next(events).decode("utf-8")
+    assert "event: publish" in event
+    assert json.loads(event.split("data: ", 1)[1])["pid"] == recid
+
+    # Closing the stream unsubscribes
+    response.close()
+    assert not app.extensions["invenio-drafts-resources"].feed. \
+        has_subscribers(feed_channel(draft))